@@ -0,0 +1,247 @@
+import atexit
+import threading
+from collections import deque
+from itertools import chain
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from peewee import CharField, DateTimeField, IntegerField, Model, TextField
+
+from nexus.nexus_base.nexus_models import db
+
+
+class A2AConversation(Model):
+    """Agent-to-agent exchange that has aged out of the in-memory history"""
+
+    orchestration = CharField(index=True)
+    thread_id = CharField(null=True, index=True)
+    from_profile = CharField(index=True)
+    to_profile = CharField(index=True)
+    request = TextField()
+    response = TextField()
+    depth = IntegerField(default=0)
+    timestamp = DateTimeField(default=datetime.now, index=True)
+
+    class Meta:
+        database = db
+
+
+class A2AHistory:
+    """Fixed-capacity A2A conversation history with write-behind persistence.
+
+    The newest ``capacity`` entries live in a ring buffer. Entries pushed out
+    of it are queued and written to the ``A2AConversation`` table in batches by
+    a background thread, so appends never wait on the database. Pages are read
+    newest first, from the buffer and then from the table.
+    """
+
+    def __init__(
+            self,
+            capacity: int = 200,
+            persist: bool = True,
+            batch_size: int = 50,
+            flush_interval: float = 2.0
+    ):
+        self.capacity = capacity
+        self.persist = persist
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._entries = deque()
+        self._pending = []
+        self._flushing = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._writer = None
+        self._table_ready = False
+
+    def append(self, entry: Dict):
+        """Add an entry, evicting the oldest one to persistence when full"""
+        entry = dict(entry)
+        entry.setdefault("timestamp", datetime.now())
+        with self._lock:
+            self._entries.append(entry)
+            while len(self._entries) > self.capacity:
+                evicted = self._entries.popleft()
+                if self.persist:
+                    self._pending.append(evicted)
+            pending = len(self._pending)
+
+        if pending:
+            self._start_writer()
+            if pending >= self.batch_size:
+                self._wake.set()
+
+    def get_page(
+            self,
+            page: int = 0,
+            page_size: int = 20,
+            orchestration: Optional[str] = None,
+            thread_id: Optional[str] = None,
+            profile: Optional[str] = None
+    ) -> List[Dict]:
+        """Get one page of entries, newest first, matching the filters"""
+        start = page * page_size
+        end = start + page_size
+
+        with self._lock:
+            recent = [
+                entry for entry in reversed(self._entries)
+                if self._matches(entry, orchestration, thread_id, profile)
+            ]
+
+        result = recent[start:end]
+        if len(result) < page_size and self.persist:
+            offset = max(0, start - len(recent))
+            limit = page_size - len(result)
+            result.extend(self._query_persisted(orchestration, thread_id, profile, offset, limit))
+        return result
+
+    def count(
+            self,
+            orchestration: Optional[str] = None,
+            thread_id: Optional[str] = None,
+            profile: Optional[str] = None
+    ) -> int:
+        """Count entries matching the filters, without waiting for a flush"""
+        with self._lock:
+            # Entries waiting for the writer are counted from memory
+            total = sum(
+                1 for entry in chain(self._entries, self._pending, self._flushing)
+                if self._matches(entry, orchestration, thread_id, profile)
+            )
+        if self.persist:
+            if self._table_ready or self._ensure_table():
+                total += self._persisted_query(orchestration, thread_id, profile).count()
+        return total
+
+    def get_recent(self) -> List[Dict]:
+        """Get the in-memory entries, oldest first"""
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self, orchestration: Optional[str] = None):
+        """Remove entries, for one orchestration or all of them"""
+        with self._lock:
+            self._entries = deque(
+                entry for entry in self._entries
+                if orchestration is not None and entry.get("orchestration") != orchestration
+            )
+            self._pending = [
+                entry for entry in self._pending
+                if orchestration is not None and entry.get("orchestration") != orchestration
+            ]
+        if self.persist and self._ensure_table():
+            with db.atomic():
+                query = A2AConversation.delete()
+                if orchestration is not None:
+                    query = query.where(A2AConversation.orchestration == orchestration)
+                query.execute()
+
+    def flush(self):
+        """Write every pending entry to the database now"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                self._flushing = batch
+            if not batch or not self._ensure_table():
+                with self._lock:
+                    self._flushing = []
+                return
+            rows = [
+                {
+                    "orchestration": entry.get("orchestration") or "",
+                    "thread_id": entry.get("thread_id"),
+                    "from_profile": entry["from"],
+                    "to_profile": entry["to"],
+                    "request": entry["request"],
+                    "response": entry["response"],
+                    "depth": entry.get("depth", 0),
+                    "timestamp": entry["timestamp"],
+                }
+                for entry in batch
+            ]
+            try:
+                with db.atomic():
+                    for index in range(0, len(rows), self.batch_size):
+                        A2AConversation.insert_many(rows[index:index + self.batch_size]).execute()
+            except Exception as e:
+                print(f"Error persisting A2A conversation history: {str(e)}")
+            finally:
+                with self._lock:
+                    self._flushing = []
+
+    def _start_writer(self):
+        if self._writer is not None:
+            return
+        with self._lock:
+            if self._writer is not None:
+                return
+            self._writer = threading.Thread(target=self._write_behind, daemon=True)
+            self._writer.start()
+            atexit.register(self.flush)
+
+    def _write_behind(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _ensure_table(self) -> bool:
+        if self._table_ready:
+            return True
+        try:
+            db.create_tables([A2AConversation], safe=True)
+            self._table_ready = True
+        except Exception as e:
+            print(f"Error creating A2A conversation table: {str(e)}")
+        return self._table_ready
+
+    def _query_persisted(self, orchestration, thread_id, profile, offset, limit) -> List[Dict]:
+        self.flush()
+        if not self._table_ready:
+            return []
+        query = (
+            self._persisted_query(orchestration, thread_id, profile)
+            .order_by(A2AConversation.timestamp.desc(), A2AConversation.id.desc())
+            .offset(offset)
+            .limit(limit)
+        )
+        return [
+            {
+                "orchestration": row.orchestration,
+                "thread_id": row.thread_id,
+                "from": row.from_profile,
+                "to": row.to_profile,
+                "request": row.request,
+                "response": row.response,
+                "depth": row.depth,
+                "timestamp": row.timestamp,
+            }
+            for row in query
+        ]
+
+    def _persisted_query(self, orchestration, thread_id, profile):
+        query = A2AConversation.select()
+        if orchestration is not None:
+            query = query.where(A2AConversation.orchestration == orchestration)
+        if thread_id is not None:
+            query = query.where(A2AConversation.thread_id == thread_id)
+        if profile is not None:
+            query = query.where(
+                (A2AConversation.from_profile == profile) | (A2AConversation.to_profile == profile)
+            )
+        return query
+
+    def _matches(self, entry: Dict, orchestration, thread_id, profile) -> bool:
+        if orchestration is not None and entry.get("orchestration") != orchestration:
+            return False
+        if thread_id is not None and entry.get("thread_id") != thread_id:
+            return False
+        if profile is not None and profile not in (entry.get("from"), entry.get("to")):
+            return False
+        return True
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
@@ -3,6 +3,8 @@ import streamlit as st
 from nexus.streamlit_ui.agent_panel import agent_panel
 from nexus.streamlit_ui.cache import get_nexus
 
+MESSAGE_PAGE_SIZE = 50
+
 
 def chat_page(username, win_height):
     chat = get_nexus()
@@ -11,16 +13,51 @@ def chat_page(username, win_height):
         st.error("Invalid user")
         st.stop()
 
-    # Initialize session state for threads and current_thread_id if not already present
-    if "threads" not in st.session_state:
-        threads = chat.get_threads_for_user(username)
-        st.session_state["threads"] = threads
+    # Threads come back with their unread counts in one query, so refresh every run
+    st.session_state["threads"] = chat.get_threads_for_user(username)
+    for thread in st.session_state["threads"]:
+        if (
+            thread.thread_id == st.session_state.get("current_thread_id")
+            and thread.unread_count
+        ):
+            # Everything in the open thread is shown below, so it counts as read;
+            # skipping threads with nothing unread keeps reruns free of writes
+            chat.mark_notifications_read(username, thread.thread_id)
+            thread.unread_count = 0
     if "current_thread_id" not in st.session_state:
         st.session_state["current_thread_id"] = None
 
+    if "thread_messages" not in st.session_state:
+        st.session_state["thread_messages"] = {}
+    # Threads whose oldest message, archived or not, is already loaded
+    if "thread_history_complete" not in st.session_state:
+        st.session_state["thread_history_complete"] = set()
+
+    def load_thread_messages(thread_id):
+        # Read the tail once, then only what was posted since the last message shown
+        messages = st.session_state["thread_messages"].get(thread_id)
+        if messages:
+            messages += chat.read_messages_page(thread_id, None, since_id=messages[-1].id)
+        else:
+            messages = chat.read_messages_page(thread_id, MESSAGE_PAGE_SIZE)
+            if len(messages) < MESSAGE_PAGE_SIZE:
+                st.session_state["thread_history_complete"].add(thread_id)
+        st.session_state["thread_messages"][thread_id] = messages
+        return messages
+
+    def load_earlier_messages(thread_id):
+        messages = st.session_state["thread_messages"].get(thread_id) or []
+        if messages:
+            earlier = chat.read_messages_page(
+                thread_id, MESSAGE_PAGE_SIZE, before_id=messages[0].id
+            )
+            # Pages read on into the archive, so a short one is the start of the thread
+            if len(earlier) < MESSAGE_PAGE_SIZE:
+                st.session_state["thread_history_complete"].add(thread_id)
+            st.session_state["thread_messages"][thread_id] = earlier + messages
+
     def select_thread(thread_id):
         st.session_state["current_thread_id"] = thread_id
-        thread_history = chat.read_messages(thread_id)
         # Here, we find the thread by ID and set its 'agent' attribute
         for thread in st.session_state["threads"]:
             if thread.thread_id == thread_id:
@@ -42,7 +79,10 @@ def chat_page(username, win_height):
 
         st.header("Recent chats")
         for thread in st.session_state["threads"]:
-            if st.button(thread.title, key=thread.thread_id):
+            label = thread.title
+            if thread.unread_count:
+                label = f"{thread.title} ({thread.unread_count})"
+            if st.button(label, key=thread.thread_id):
                 select_thread(thread.thread_id)
 
     # Main chat UI
@@ -55,7 +95,16 @@ def chat_page(username, win_height):
                 with col_chat:
                     st.title(current_thread.title)
                     with st.container(height=win_height - 300):
-                        messages = chat.read_messages(current_thread.thread_id)
+                        messages = load_thread_messages(current_thread.thread_id)
+                        if (
+                            current_thread.thread_id
+                            not in st.session_state["thread_history_complete"]
+                        ):
+                            st.button(
+                                "Load earlier messages",
+                                on_click=load_earlier_messages,
+                                args=(current_thread.thread_id,),
+                            )
                         for message in messages:
                             with st.chat_message(
                                 message.author.username, avatar=message.author.avatar
@@ -99,20 +148,28 @@ def chat_page(username, win_height):
                                 )
 
                                 if is_orchestration:
-                                    # Orchestration mode: use orchestration manager
-                                    response_stream = chat.orchestrate_request_stream(
-                                        user_input, current_thread.thread_id
+                                    # Orchestration mode: stream chunks as the agents produce them
+                                    progress = st.empty()
+
+                                    def show_progress(event):
+                                        progress.caption(f"🔀 {event['message']}...")
+
+                                    response_stream = chat.orchestrate_agent_request_stream(
+                                        user_input,
+                                        current_thread.thread_id,
+                                        progress_callback=show_progress,
                                     )
                                     agent_response = st.write_stream(response_stream)
+                                    progress.empty()
                                 else:
                                     # Single-agent mode: use regular agent flow
-                                    knowledge_rag = chat.apply_knowledge_RAG(
-                                        chat_agent.knowledge_store, user_input
-                                    )
-                                    memory_rag = chat.apply_memory_RAG(
-                                        chat_agent.memory_store, user_input, chat_agent
+                                    # Knowledge and memory are looked up concurrently
+                                    content = user_input + chat.retrieve_context(
+                                        chat_agent.knowledge_store,
+                                        chat_agent.memory_store,
+                                        user_input,
+                                        chat_agent,
                                     )
-                                    content = user_input + knowledge_rag + memory_rag
                                     st.write_stream(
                                         chat_agent.get_response_stream(
                                             content, current_thread.thread_id
@@ -120,13 +177,14 @@ def chat_page(username, win_height):
                                     )
                                     agent_response = chat_agent.last_message
 
-                                    # Handle memory for single-agent mode
+                                    # Memory is written in the background so the reply posts now
                                     if chat_agent.memory_store != "None":
                                         chat.append_memory(
                                             chat_agent.memory_store,
                                             user_input,
                                             agent_response,
                                             chat_agent,
+                                            wait=False,
                                         )
 
                                 chat.set_tracking_id("Not set")
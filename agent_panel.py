@@ -63,10 +63,37 @@ def agent_panel(chat):
 
             # Show A2A conversation history
             with st.expander("A2A Conversation History", expanded=False):
-                history = chat.get_a2a_conversation_history()
+                profile_names = [cfg['profile'] for cfg in orchestration_config.agent_network]
+                profile_filter = st.selectbox(
+                    "Filter by profile:",
+                    ["All"] + profile_names,
+                    key="a2a_profile_filter",
+                )
+                profile_filter = None if profile_filter == "All" else profile_filter
+                thread_filter = None
+                if st.checkbox("Only this chat", key="a2a_thread_filter"):
+                    thread_filter = st.session_state.get("current_thread_id")
+
+                # Only the page on screen is loaded, newest entries first
+                page_size = 10
+                total = chat.count_a2a_conversation_history(thread_filter, profile_filter)
+                pages = max(1, (total + page_size - 1) // page_size)
+                # A new filter starts from the first page, and a stored page past
+                # the end would make number_input raise
+                filters = (profile_filter, thread_filter)
+                if st.session_state.get("a2a_filters") != filters:
+                    st.session_state["a2a_filters"] = filters
+                    st.session_state["a2a_page"] = 1
+                elif st.session_state.get("a2a_page", 1) > pages:
+                    st.session_state["a2a_page"] = pages
+                page = st.number_input("Page", min_value=1, max_value=pages, key="a2a_page")
+                history = chat.get_a2a_conversation_history(
+                    page - 1, page_size, thread_filter, profile_filter
+                )
                 if history:
                     for idx, conv in enumerate(history):
-                        st.write(f"**{idx + 1}. {conv['from']} → {conv['to']}** (Depth: {conv['depth']})")
+                        number = total - (page - 1) * page_size - idx
+                        st.write(f"**{number}. {conv['from']} → {conv['to']}** (Depth: {conv['depth']})")
                         st.write(f"Request: {conv['request'][:100]}...")
                         if len(conv['request']) > 100:
                             with st.expander("Full Request"):
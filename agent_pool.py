@@ -0,0 +1,148 @@
+import copy
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def copy_agent(agent):
+    """Make a separate agent instance from a shared one.
+
+    The copy shares clients and configuration with the original but has its
+    own lists, dicts and sets, so setting a profile, actions or messages on
+    it, or running it on another thread, does not touch the original.
+    """
+    instance = copy.copy(agent)
+    for name, value in list(vars(instance).items()):
+        if isinstance(value, (list, dict, set)):
+            setattr(instance, name, copy.copy(value))
+    return instance
+
+
+class AgentPool:
+    """Pool of pre-initialized agents keyed by (engine, profile).
+
+    Agents are built once by ``factory(engine_name, profile_name)``, which must
+    return a new instance for every call, and handed out again after a reset
+    that only clears their ``messages``. Idle agents
+    are capped at ``max_size`` (least recently returned evicted first) and
+    dropped once they sit unused for longer than ``idle_timeout`` seconds.
+    """
+
+    def __init__(
+            self,
+            factory: Callable[[str, str], Any],
+            max_size: int = 16,
+            idle_timeout: float = 300.0
+    ):
+        self.factory = factory
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._idle: "OrderedDict[Tuple[str, str], deque]" = OrderedDict()
+        self._idle_count = 0
+        self._leases: Dict[int, Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def checkout(self, engine_name: str, profile_name: str):
+        """Get a reset agent for the key, building one on a pool miss"""
+        key = (engine_name, profile_name)
+        agent = None
+        with self._lock:
+            self._evict_idle_locked()
+            agents = self._idle.get(key)
+            if agents:
+                agent, _ = agents.pop()
+                self._idle_count -= 1
+                if not agents:
+                    del self._idle[key]
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if agent is None:
+            agent = self.factory(engine_name, profile_name)
+
+        self.reset(agent)
+        with self._lock:
+            if id(agent) in self._leases:
+                # A factory handing out a shared object would lease it twice
+                raise RuntimeError(f"Agent for {key} is already checked out")
+            self._leases[id(agent)] = key
+        return agent
+
+    def checkin(self, agent):
+        """Return a checked-out agent to the pool"""
+        with self._lock:
+            key = self._leases.pop(id(agent), None)
+            if key is None:
+                return
+            self._idle.setdefault(key, deque()).append((agent, time.monotonic()))
+            self._idle.move_to_end(key)
+            self._idle_count += 1
+            self._evict_idle_locked()
+            while self._idle_count > self.max_size:
+                self._evict_oldest_locked()
+
+    def discard(self, agent):
+        """Forget a checked-out agent that should not be reused"""
+        with self._lock:
+            if self._leases.pop(id(agent), None) is not None:
+                self.evictions += 1
+
+    def reset(self, agent):
+        """Clear per-conversation state without rebuilding the agent"""
+        if hasattr(agent, 'messages'):
+            agent.messages = []
+
+    def evict_idle(self) -> int:
+        """Drop agents idle for longer than idle_timeout, returning how many"""
+        with self._lock:
+            return self._evict_idle_locked()
+
+    def clear(self):
+        """Drop every idle agent"""
+        with self._lock:
+            self.evictions += self._idle_count
+            self._idle.clear()
+            self._idle_count = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "idle": self._idle_count,
+                "checked_out": len(self._leases),
+                "max_size": self.max_size,
+            }
+
+    def _evict_idle_locked(self) -> int:
+        if self.idle_timeout is None:
+            return 0
+        cutoff = time.monotonic() - self.idle_timeout
+        evicted = 0
+        for key in list(self._idle):
+            agents = self._idle[key]
+            while agents and agents[0][1] < cutoff:
+                agents.popleft()
+                evicted += 1
+            if not agents:
+                del self._idle[key]
+        self._idle_count -= evicted
+        self.evictions += evicted
+        return evicted
+
+    def _evict_oldest_locked(self):
+        key, agents = next(iter(self._idle.items()))
+        agents.popleft()
+        if not agents:
+            del self._idle[key]
+        self._idle_count -= 1
+        self.evictions += 1
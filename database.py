@@ -0,0 +1,256 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+from peewee import DatabaseProxy, SqliteDatabase
+
+# Tuned for many readers and short writes: WAL lets readers run alongside the
+# writer, NORMAL sync is safe with WAL, and writers wait instead of failing
+DEFAULT_SQLITE_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "busy_timeout": 5000,
+    "cache_size": -64000,
+    "temp_store": "memory",
+    "mmap_size": 268435456,
+}
+
+_STOP = object()
+
+
+def configure_database(
+        database,
+        url: Optional[str] = None,
+        pragmas: Optional[Dict[str, Any]] = None,
+        max_connections: int = 20,
+        stale_timeout: int = 300
+):
+    """Set up the shared database for concurrent sessions.
+
+    With a ``url`` (any playhouse.db_url scheme, e.g. ``postgresql+pool://``
+    for a pooled server connection) the database must be a DatabaseProxy,
+    which is initialized with the new backend. Otherwise a SQLite database
+    gets ``pragmas`` (DEFAULT_SQLITE_PRAGMAS by default) on every connection.
+    Returns the underlying database.
+    """
+    if url:
+        if not isinstance(database, DatabaseProxy):
+            raise ValueError(
+                "Switching database backends needs nexus_models.db to be a DatabaseProxy"
+            )
+        from playhouse.db_url import connect
+
+        options = {}
+        if "+pool" in url.split("://", 1)[0]:
+            options = {"max_connections": max_connections, "stale_timeout": stale_timeout}
+        database.initialize(connect(url, **options))
+
+    target = _unwrap(database)
+    if isinstance(target, SqliteDatabase):
+        for key, value in (pragmas if pragmas is not None else DEFAULT_SQLITE_PRAGMAS).items():
+            # permanent=True also applies it to connections opened later
+            target.pragma(key, value, permanent=True)
+    return target
+
+
+def _unwrap(database):
+    return database.obj if isinstance(database, DatabaseProxy) else database
+
+
+class WriteBatcher:
+    """Groups short write transactions into one commit on a writer thread.
+
+    ``run(work)`` queues a function and waits for its result. The writer
+    takes up to ``max_batch_size`` queued functions, waiting at most
+    ``max_batch_delay`` seconds for more to arrive, and runs each one in its
+    own savepoint inside a single transaction, so one failing write does not
+    undo the others and the batch pays for one commit. A write with no other
+    write in flight runs inline on the caller's thread, as does work already
+    inside a transaction or submitted while batching is off. Inline writes
+    that begin their own transaction count in the stats as batches of one.
+    """
+
+    def __init__(
+            self,
+            database,
+            enabled: bool = True,
+            max_batch_size: int = 32,
+            max_batch_delay: float = 0.002
+    ):
+        self.database = database
+        self.enabled = enabled
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_batch_delay = max_batch_delay
+        self._queue = queue.Queue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "batches": 0,
+            "writes": 0,
+            "inline_writes": 0,
+            "errors": 0,
+            "queue_wait_ms": 0.0,
+            "max_queue_wait_ms": 0.0,
+            "lock_wait_ms": 0.0,
+            "max_lock_wait_ms": 0.0,
+            "transaction_ms": 0.0,
+        }
+
+    def run(self, work: Callable[[], Any]) -> Any:
+        """Run a write function in a batch and return its result"""
+        if (
+                not self.enabled
+                or threading.current_thread() is self._writer
+                or self.database.in_transaction()
+        ):
+            return self._run_inline(work)
+
+        with self._in_flight_lock:
+            alone = self._in_flight == 0
+            self._in_flight += 1
+        try:
+            if alone:
+                # Nothing to batch with, so skip the hop to the writer thread
+                return self._run_inline(work)
+            return self.submit(work).result()
+        finally:
+            with self._in_flight_lock:
+                self._in_flight -= 1
+
+    def submit(self, work: Callable[[], Any]) -> Future:
+        """Queue a write function, returning a Future for its result"""
+        future = Future()
+        self._start_writer()
+        self._queue.put((work, future, time.perf_counter()))
+        return future
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batch counts and queue, lock and transaction timings"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        batches = stats["batches"]
+        stats["mean_batch_size"] = stats["writes"] / batches if batches else 0.0
+        stats["mean_lock_wait_ms"] = stats["lock_wait_ms"] / batches if batches else 0.0
+        stats["mean_queue_wait_ms"] = stats["queue_wait_ms"] / stats["writes"] if stats["writes"] else 0.0
+        stats["pending"] = self._queue.qsize()
+        return stats
+
+    def close(self):
+        """Finish queued writes and stop the writer thread"""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(_STOP)
+            writer.join()
+
+    def _run_inline(self, work: Callable[[], Any]) -> Any:
+        if self.database.in_transaction():
+            # Only a savepoint in the caller's transaction, which is timed by whoever began it
+            with self.database.atomic():
+                return work()
+
+        # A transaction of its own, timed and counted like a batch of one
+        started = time.perf_counter()
+        lock_wait = None
+        failed = False
+        try:
+            with self._transaction():
+                lock_wait = time.perf_counter() - started
+                return work()
+        except Exception:
+            failed = True
+            raise
+        finally:
+            if lock_wait is None:
+                lock_wait = time.perf_counter() - started
+            transaction = time.perf_counter() - started - lock_wait
+            with self._stats_lock:
+                stats = self._stats
+                stats["batches"] += 1
+                stats["writes"] += 1
+                stats["inline_writes"] += 1
+                stats["errors"] += 1 if failed else 0
+                stats["lock_wait_ms"] += lock_wait * 1000
+                stats["max_lock_wait_ms"] = max(stats["max_lock_wait_ms"], lock_wait * 1000)
+                stats["transaction_ms"] += transaction * 1000
+
+    def _start_writer(self):
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_batches, name="nexus-db-writer", daemon=True
+                )
+                self._writer.start()
+
+    def _write_batches(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stop = False
+            deadline = time.perf_counter() + self.max_batch_delay
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.perf_counter()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._write(batch)
+            if stop:
+                return
+
+    def _write(self, batch):
+        started = time.perf_counter()
+        queue_waits = [started - queued_at for _, _, queued_at in batch]
+        outcomes = []
+        lock_wait = 0.0
+        try:
+            with self._transaction():
+                lock_wait = time.perf_counter() - started
+                for work, _, _ in batch:
+                    try:
+                        with self.database.atomic():
+                            outcomes.append((work(), None))
+                    except Exception as e:
+                        outcomes.append((None, e))
+        except Exception as e:
+            # The commit itself failed, nothing in the batch was written
+            outcomes = [(None, e)] * len(batch)
+        transaction = time.perf_counter() - started - lock_wait
+
+        errors = 0
+        for (_, future, _), (result, error) in zip(batch, outcomes):
+            if error is not None:
+                errors += 1
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+        with self._stats_lock:
+            stats = self._stats
+            stats["batches"] += 1
+            stats["writes"] += len(batch)
+            stats["errors"] += errors
+            stats["queue_wait_ms"] += sum(queue_waits) * 1000
+            stats["max_queue_wait_ms"] = max(stats["max_queue_wait_ms"], max(queue_waits) * 1000)
+            stats["lock_wait_ms"] += lock_wait * 1000
+            stats["max_lock_wait_ms"] = max(stats["max_lock_wait_ms"], lock_wait * 1000)
+            stats["transaction_ms"] += transaction * 1000
+
+    def _transaction(self):
+        if isinstance(_unwrap(self.database), SqliteDatabase):
+            # Take the write lock at BEGIN so the time spent waiting for it is measurable
+            return self.database.atomic("IMMEDIATE")
+        return self.database.atomic()
@@ -0,0 +1,171 @@
+import contextvars
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+_STOP = object()
+
+
+class DocumentIngestor:
+    """Splits, embeds and stores documents with the three steps overlapped.
+
+    Parse workers split each document into chunks and queue them in batches
+    of ``batch_size``; embed workers send whole batches to the embedding
+    model; a single writer stores the embedded batches. Bounded queues
+    between the steps keep memory flat when one step is the bottleneck, and
+    a failure in one document does not stop the others.
+
+    ``split(document)`` returns ``(name, chunks)``, ``embed_batch(texts)``
+    returns one vector per text, and ``write(name, start, chunks, vectors)``
+    stores a batch whose first chunk is number ``start`` in the document.
+    """
+
+    def __init__(
+            self,
+            split: Callable[[Any], Tuple[str, List[str]]],
+            embed_batch: Callable[[List[str]], List[Any]],
+            write: Callable[[str, int, List[str], List[Any]], None],
+            batch_size: int = 64,
+            parse_workers: int = 2,
+            embed_workers: int = 4,
+            queue_size: int = 8
+    ):
+        self.split = split
+        self.embed_batch = embed_batch
+        self.write = write
+        self.batch_size = max(1, int(batch_size))
+        self.parse_workers = max(1, int(parse_workers))
+        self.embed_workers = max(1, int(embed_workers))
+        self.queue_size = max(1, int(queue_size))
+
+    def ingest(
+            self,
+            documents: Iterable[Any],
+            progress_callback: Optional[Callable[[Dict], None]] = None
+    ) -> List[Dict]:
+        """Ingest every document and return one result per document, in order.
+
+        Each result has ``document`` (its name), ``chunks``, ``written`` and
+        ``error``. ``progress_callback`` is invoked from worker threads with
+        ``stage`` ("parsed", "embedded" or "written"), ``document``,
+        ``index``, ``chunks`` and ``written``.
+        """
+        documents = list(documents)
+        results = [
+            {"document": None, "chunks": 0, "written": 0, "error": None}
+            for _ in documents
+        ]
+        results_lock = threading.Lock()
+        inbox = queue.Queue()
+        to_embed = queue.Queue(maxsize=self.queue_size)
+        to_write = queue.Queue(maxsize=self.queue_size)
+
+        for index, document in enumerate(documents):
+            inbox.put((index, document))
+        inbox.put(_STOP)
+
+        def report(stage, index):
+            if progress_callback is None:
+                return
+            with results_lock:
+                result = dict(results[index])
+            try:
+                progress_callback({
+                    "stage": stage,
+                    "document": result["document"],
+                    "index": index,
+                    "chunks": result["chunks"],
+                    "written": result["written"],
+                })
+            except Exception as e:
+                print(f"Error in ingestion progress callback: {str(e)}")
+
+        def fail(index, error):
+            with results_lock:
+                if results[index]["error"] is None:
+                    results[index]["error"] = error
+
+        def parse():
+            while True:
+                item = inbox.get()
+                if item is _STOP:
+                    inbox.put(_STOP)
+                    return
+                index, document = item
+                try:
+                    name, chunks = self.split(document)
+                except Exception as e:
+                    with results_lock:
+                        results[index]["document"] = getattr(document, "name", str(document))
+                    fail(index, f"split: {str(e)}")
+                    report("parsed", index)
+                    continue
+                chunks = list(chunks)
+                with results_lock:
+                    results[index]["document"] = name
+                    results[index]["chunks"] = len(chunks)
+                report("parsed", index)
+                for start in range(0, len(chunks), self.batch_size):
+                    to_embed.put((index, name, start, chunks[start:start + self.batch_size]))
+
+        def embed():
+            while True:
+                item = to_embed.get()
+                if item is _STOP:
+                    to_embed.put(_STOP)
+                    return
+                index, name, start, chunks = item
+                if results[index]["error"] is not None:
+                    continue
+                try:
+                    vectors = list(self.embed_batch(chunks))
+                    if len(vectors) != len(chunks):
+                        raise ValueError(f"expected {len(chunks)} embeddings, got {len(vectors)}")
+                except Exception as e:
+                    fail(index, f"embed: {str(e)}")
+                    continue
+                report("embedded", index)
+                to_write.put((index, name, start, chunks, vectors))
+
+        def write():
+            while True:
+                item = to_write.get()
+                if item is _STOP:
+                    return
+                index, name, start, chunks, vectors = item
+                if results[index]["error"] is not None:
+                    continue
+                try:
+                    self.write(name, start, chunks, vectors)
+                except Exception as e:
+                    fail(index, f"write: {str(e)}")
+                    continue
+                with results_lock:
+                    results[index]["written"] += len(chunks)
+                report("written", index)
+
+        def start_workers(target, count):
+            # Workers run in a copy of the caller's context so tracking ids carry over
+            workers = [
+                threading.Thread(target=contextvars.copy_context().run, args=(target,), daemon=True)
+                for _ in range(count)
+            ]
+            for worker in workers:
+                worker.start()
+            return workers
+
+        parsers = start_workers(parse, self.parse_workers)
+        embedders = start_workers(embed, self.embed_workers)
+        writers = start_workers(write, 1)
+
+        for worker in parsers:
+            worker.join()
+        to_embed.put(_STOP)
+        for worker in embedders:
+            worker.join()
+        to_write.put(_STOP)
+        for worker in writers:
+            worker.join()
+
+        return results
+
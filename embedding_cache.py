@@ -0,0 +1,246 @@
+import functools
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class EmbeddingCache:
+    """Content-addressed cache of embedding vectors, keyed by (model, text hash).
+
+    Vectors are stored as float32. The newest ones stay in an in-memory LRU
+    bounded by ``max_entries`` and ``max_bytes``; with a ``path`` every vector
+    is also written to a SQLite file, bounded by ``max_disk_bytes`` with least
+    recently used rows evicted first, so repeated texts survive restarts.
+    """
+
+    def __init__(
+            self,
+            max_entries: int = 10000,
+            max_bytes: Optional[int] = 64 * 1024 * 1024,
+            path: Optional[str] = None,
+            max_disk_bytes: Optional[int] = 1024 * 1024 * 1024
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.path = path
+        self.max_disk_bytes = max_disk_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._connection = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        if path:
+            self._open_store(path)
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        """Hash a model name and input text into a cache key"""
+        digest = hashlib.sha256()
+        digest.update(model.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        """Get a cached vector, or None on a miss"""
+        return self.get_many(model, [text])[0]
+
+    def get_many(self, model: str, texts: Iterable[str]) -> List[Optional[List[float]]]:
+        """Get cached vectors for several texts, None where missing"""
+        keys = [self.make_key(model, text) for text in texts]
+        with self._lock:
+            found = {}
+            from_disk = set()
+            for key in dict.fromkeys(keys):
+                data = self._entries.get(key)
+                if data is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = data
+            missing = [key for key in dict.fromkeys(keys) if key not in found]
+
+            if missing and self._connection is not None:
+                now = time.time()
+                for start in range(0, len(missing), 500):
+                    batch = missing[start:start + 500]
+                    placeholders = ", ".join("?" * len(batch))
+                    rows = self._connection.execute(
+                        f"SELECT key, vector FROM embedding_cache WHERE key IN ({placeholders})", batch
+                    ).fetchall()
+                    for key, data in rows:
+                        found[key] = data
+                        from_disk.add(key)
+                        self._store_locked(key, data)
+                    if rows:
+                        self._connection.executemany(
+                            "UPDATE embedding_cache SET accessed_at = ? WHERE key = ?",
+                            [(now, key) for key, _ in rows]
+                        )
+                self._connection.commit()
+
+            vectors = []
+            for key in keys:
+                data = found.get(key)
+                if data is None:
+                    self.misses += 1
+                    vectors.append(None)
+                    continue
+                if key in from_disk:
+                    # Repeats of the same text in this call count as memory hits
+                    from_disk.discard(key)
+                    self.disk_hits += 1
+                else:
+                    self.memory_hits += 1
+                vectors.append(self._decode(data))
+            return vectors
+
+    def set(self, model: str, text: str, vector: Any) -> Any:
+        """Store a vector and return it as later hits will (float32 values).
+
+        Values that are not a flat list of numbers are not stored and are
+        returned unchanged.
+        """
+        return self.set_many(model, [(text, vector)])[0]
+
+    def set_many(self, model: str, items: Iterable[tuple]) -> List[Any]:
+        """Store several (text, vector) pairs, returning the vectors as stored"""
+        encoded = []
+        stored = []
+        for text, vector in items:
+            data = self._encode(vector)
+            if data is None:
+                stored.append(vector)
+                continue
+            encoded.append((self.make_key(model, text), data))
+            # A miss returns the same rounded values a hit would
+            stored.append(self._decode(data))
+        if not encoded:
+            return stored
+
+        now = time.time()
+        with self._lock:
+            for key, data in encoded:
+                self._store_locked(key, data)
+            if self._connection is not None:
+                for key, data in encoded:
+                    previous = self._connection.execute(
+                        "SELECT LENGTH(vector) FROM embedding_cache WHERE key = ?", (key,)
+                    ).fetchone()
+                    if previous:
+                        self._disk_bytes -= previous[0]
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO embedding_cache (key, vector, accessed_at) VALUES (?, ?, ?)",
+                        (key, data, now)
+                    )
+                    self._disk_bytes += len(data)
+                self._trim_store_locked()
+                self._connection.commit()
+        return stored
+
+    def wrap(self, embed: Callable, default_model: str = "text-embedding-3-small") -> Callable:
+        """Wrap an ``embed(input_text, model)`` function so it reads through the cache"""
+
+        @functools.wraps(embed)
+        def cached_embed(input_text, model=default_model):
+            vector = self.get(model, input_text)
+            if vector is None:
+                vector = self.set(model, input_text, embed(input_text, model))
+            return vector
+
+        return cached_embed
+
+    def clear(self):
+        """Remove every cached vector"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self._connection is not None:
+                self._connection.execute("DELETE FROM embedding_cache")
+                self._connection.commit()
+                self._disk_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and current sizes"""
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "disk_evictions": self.disk_evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "disk_bytes": self._disk_bytes,
+                "persistent": self._connection is not None,
+            }
+
+    def _open_store(self, path: str):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_cache ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS embedding_cache_accessed ON embedding_cache (accessed_at)"
+        )
+        self._connection.commit()
+        self._disk_bytes = self._connection.execute(
+            "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embedding_cache"
+        ).fetchone()[0]
+
+    def _encode(self, vector: Any) -> Optional[bytes]:
+        try:
+            data = array("f", vector).tobytes()
+        except (TypeError, ValueError):
+            return None
+        return data or None
+
+    def _decode(self, data: bytes) -> List[float]:
+        vector = array("f")
+        vector.frombytes(data)
+        return vector.tolist()
+
+    def _store_locked(self, key: str, data: bytes):
+        if key in self._entries:
+            self._bytes -= len(self._entries.pop(key))
+        self._entries[key] = data
+        self._bytes += len(data)
+        while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, oldest = self._entries.popitem(last=False)
+            self._bytes -= len(oldest)
+            self.evictions += 1
+
+    def _trim_store_locked(self):
+        if self.max_disk_bytes is None:
+            return
+        while self._disk_bytes > self.max_disk_bytes:
+            rows = self._connection.execute(
+                "SELECT key, LENGTH(vector) FROM embedding_cache ORDER BY accessed_at ASC LIMIT 256"
+            ).fetchall()
+            if not rows:
+                self._disk_bytes = 0
+                return
+            for key, size in rows:
+                if self._disk_bytes <= self.max_disk_bytes:
+                    break
+                self._connection.execute("DELETE FROM embedding_cache WHERE key = ?", (key,))
+                self._disk_bytes -= size
+                self.disk_evictions += 1
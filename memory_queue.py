@@ -0,0 +1,471 @@
+import atexit
+import contextvars
+import functools
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_STOP = object()
+
+# The batch and position of the write running in this context, if any
+_active_batch = contextvars.ContextVar("nexus_embedding_batch", default=None)
+
+
+class WriteDeferred(Exception):
+    """An earlier write in the same batch failed, so this one was stopped before storing anything"""
+
+
+class MemoryWriteQueue:
+    """Write-behind queue for memory appends, ordered per store and journaled.
+
+    ``submit`` records an entry in a small SQLite journal at ``path`` and
+    returns a Future right away. Worker threads hand each store's entries to
+    ``write(store_name, entries)`` in submission order, up to
+    ``max_batch_size`` at a time and never two batches of one store at once,
+    so writes to different stores overlap while each store stays ordered.
+    ``write`` returns one ``(result, error)`` pair per entry. Failed entries
+    are retried up to ``max_attempts`` times, and entries the writer stopped
+    with ``WriteDeferred`` because an earlier one failed go back in line
+    behind it without using an attempt. Entries still in the journal
+    when the process stops are queued again by ``replay``.
+    """
+
+    def __init__(
+            self,
+            write: Callable[[str, List[Dict]], List[Tuple[Any, Optional[Exception]]]],
+            path: Optional[str] = None,
+            workers: int = 2,
+            max_batch_size: int = 16,
+            max_attempts: int = 3,
+            retry_delay: float = 1.0,
+            exit_timeout: float = 10.0
+    ):
+        self.write = write
+        self.path = path
+        self.workers = max(1, workers)
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+        self.exit_timeout = exit_timeout
+        self._pending: Dict[str, deque] = {}
+        self._scheduled = set()
+        self._ready = None
+        self._threads = []
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._outstanding = set()
+        self._next_id = 0
+        self._exit_registered = False
+        self._journal_lock = threading.Lock()
+        self._connection = None
+        self._stats = {
+            "submitted": 0,
+            "written": 0,
+            "retries": 0,
+            "failed": 0,
+            "batches": 0,
+            "replayed": 0,
+        }
+        if path:
+            try:
+                self._open_journal(path)
+            except (OSError, sqlite3.Error) as e:
+                # Queued writes still work, they just do not survive a restart
+                print(f"Error opening memory journal {path}, writes will not be journaled: {str(e)}")
+                self._connection = None
+
+    def submit(
+            self,
+            store_name: str,
+            kind: str,
+            user_input: str,
+            llm_response: Optional[str] = None,
+            agent: Any = None,
+            tracking_id: Optional[str] = None
+    ) -> Future:
+        """Queue a memory write, returning a Future for its result"""
+        entry = {
+            "store": store_name,
+            "kind": kind,
+            "user_input": user_input,
+            "llm_response": llm_response,
+            "agent": agent,
+            "agent_name": getattr(agent, "name", None),
+            "tracking_id": tracking_id,
+            "attempts": 0,
+        }
+        entry["id"] = self._journal_add(entry)
+        self._enqueue([entry])
+        with self._lock:
+            self._stats["submitted"] += 1
+        return entry["future"]
+
+    def replay(self) -> int:
+        """Queue the entries left in the journal by an earlier process"""
+        if self._connection is None:
+            return 0
+        with self._journal_lock:
+            rows = self._connection.execute(
+                "SELECT id, store, kind, user_input, llm_response, agent_name, tracking_id, attempts "
+                "FROM memory_journal ORDER BY id"
+            ).fetchall()
+        with self._lock:
+            outstanding = set(self._outstanding)
+        entries = [
+            {
+                "id": row[0],
+                "store": row[1],
+                "kind": row[2],
+                "user_input": row[3],
+                "llm_response": row[4],
+                # The agent itself is not journaled, the writer looks it up by name
+                "agent": None,
+                "agent_name": row[5],
+                "tracking_id": row[6],
+                "attempts": row[7],
+            }
+            for row in rows
+            if row[0] not in outstanding
+        ]
+        self._enqueue(entries)
+        with self._lock:
+            self._stats["replayed"] += len(entries)
+        if entries:
+            print(f"Replaying {len(entries)} journaled memory writes.")
+        return len(entries)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued write is done, False if ``timeout`` ran out first"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self._outstanding:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Drain the queue and stop the workers; unfinished writes stay journaled"""
+        drained = self.flush(timeout)
+        with self._lock:
+            threads, self._threads = self._threads, []
+            ready, self._ready = self._ready, None
+        if ready is not None:
+            for _ in threads:
+                ready.put(_STOP)
+            if drained:
+                for thread in threads:
+                    thread.join()
+        return drained
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get write counters and the number of writes still pending"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending"] = len(self._outstanding)
+            stats["stores_pending"] = len(self._scheduled)
+        stats["journaled"] = self._journal_count()
+        return stats
+
+    def _enqueue(self, entries: List[Dict]):
+        if not entries:
+            return
+        self._start_workers()
+        with self._lock:
+            for entry in entries:
+                entry.setdefault("future", Future())
+                self._pending.setdefault(entry["store"], deque()).append(entry)
+                self._outstanding.add(entry["id"])
+                self._schedule_locked(entry["store"])
+
+    def _schedule_locked(self, store_name: str):
+        if self._ready is None:
+            # Closed, what is left stays in the journal for the next replay
+            return
+        if store_name not in self._scheduled and self._pending.get(store_name):
+            self._scheduled.add(store_name)
+            self._ready.put(store_name)
+
+    def _start_workers(self):
+        with self._lock:
+            if self._threads:
+                return
+            self._ready = queue.Queue()
+            self._threads = [
+                threading.Thread(
+                    target=self._work,
+                    args=(self._ready,),
+                    name=f"nexus-memory-writer-{index}",
+                    daemon=True
+                )
+                for index in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+            register_exit, self._exit_registered = not self._exit_registered, True
+        if register_exit:
+            # Give queued writes a chance to finish, the journal keeps the rest
+            atexit.register(self.close, self.exit_timeout)
+
+    def _work(self, ready):
+        while True:
+            store_name = ready.get()
+            if store_name is _STOP:
+                return
+            with self._lock:
+                pending = self._pending.get(store_name) or deque()
+                batch = [pending.popleft() for _ in range(min(self.max_batch_size, len(pending)))]
+            try:
+                retry = self._write_batch(store_name, batch)
+            except Exception as e:
+                # A bug in the writer must not lose entries or kill the worker
+                print(f"Error writing memories to {store_name}: {str(e)}")
+                retry = [(entry, e) for entry in batch]
+
+            failed = []
+            if retry:
+                for entry, error in retry:
+                    if isinstance(error, WriteDeferred):
+                        # Not its own failure, so it does not use up an attempt
+                        failed.append(entry)
+                        continue
+                    entry["attempts"] += 1
+                    if entry["attempts"] < self.max_attempts:
+                        failed.append(entry)
+                        continue
+                    print(f"Giving up on memory write to {store_name}: {str(error)}")
+                    self._finish(entry, error=error)
+                    with self._lock:
+                        self._stats["failed"] += 1
+                if failed:
+                    self._journal_attempts(failed)
+                    with self._lock:
+                        self._stats["retries"] += len(failed)
+                    time.sleep(self.retry_delay)
+
+            with self._lock:
+                if failed:
+                    # Back to the front of the line so the store stays in order
+                    self._pending.setdefault(store_name, deque()).extendleft(reversed(failed))
+                self._scheduled.discard(store_name)
+                if not self._pending.get(store_name):
+                    self._pending.pop(store_name, None)
+                self._schedule_locked(store_name)
+
+    def _write_batch(self, store_name: str, batch: List[Dict]) -> List[Tuple[Dict, Exception]]:
+        outcomes = self.write(store_name, batch)
+        if len(outcomes) != len(batch):
+            raise ValueError(f"expected {len(batch)} outcomes, got {len(outcomes)}")
+
+        retry = []
+        written = 0
+        for entry, (result, error) in zip(batch, outcomes):
+            if error is not None:
+                retry.append((entry, error))
+                continue
+            self._finish(entry, result=result)
+            written += 1
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["written"] += written
+        return retry
+
+    def _finish(self, entry: Dict, result: Any = None, error: Optional[Exception] = None):
+        self._journal_remove(entry["id"])
+        future = entry["future"]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+        with self._idle:
+            self._outstanding.discard(entry["id"])
+            if not self._outstanding:
+                self._idle.notify_all()
+
+    def _open_journal(self, path: str):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS memory_journal ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, store TEXT NOT NULL, kind TEXT NOT NULL, "
+            "user_input TEXT, llm_response TEXT, agent_name TEXT, tracking_id TEXT, "
+            "attempts INTEGER NOT NULL DEFAULT 0, created REAL NOT NULL)"
+        )
+        self._connection.commit()
+
+    def _journal_add(self, entry: Dict) -> int:
+        if self._connection is None:
+            with self._lock:
+                self._next_id += 1
+                return self._next_id
+        with self._journal_lock:
+            cursor = self._connection.execute(
+                "INSERT INTO memory_journal "
+                "(store, kind, user_input, llm_response, agent_name, tracking_id, attempts, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, 0, ?)",
+                (
+                    entry["store"],
+                    entry["kind"],
+                    entry["user_input"],
+                    entry["llm_response"],
+                    entry["agent_name"],
+                    entry["tracking_id"],
+                    time.time(),
+                ),
+            )
+            self._connection.commit()
+            return cursor.lastrowid
+
+    def _journal_attempts(self, entries: List[Dict]):
+        if self._connection is None:
+            return
+        with self._journal_lock:
+            self._connection.executemany(
+                "UPDATE memory_journal SET attempts = ? WHERE id = ?",
+                [(entry["attempts"], entry["id"]) for entry in entries],
+            )
+            self._connection.commit()
+
+    def _journal_remove(self, entry_id: int):
+        if self._connection is None:
+            return
+        with self._journal_lock:
+            self._connection.execute("DELETE FROM memory_journal WHERE id = ?", (entry_id,))
+            self._connection.commit()
+
+    def _journal_count(self) -> int:
+        if self._connection is None:
+            return 0
+        with self._journal_lock:
+            return self._connection.execute("SELECT COUNT(*) FROM memory_journal").fetchone()[0]
+
+
+class EmbeddingBatch:
+    """Memory writes run side by side so their embeddings are requested together.
+
+    ``map`` runs each write in its own thread, so the per-turn extraction
+    calls overlap. Embedding calls made through a function wrapped with
+    ``route`` are held until every unfinished write is waiting for one, then
+    ``embed_many(texts, model)`` embeds all the held texts at once. A write
+    gets its vectors only after the writes before it have finished, so
+    whatever it stores after embedding still lands in submission order.
+    Once a write fails, the writes after it raise ``WriteDeferred`` from
+    their next embedding call instead of storing anything.
+    """
+
+    def __init__(self, embed_many: Callable[[List[str], str], List[Any]]):
+        self.embed_many = embed_many
+        self.requests = 0
+        self.texts = 0
+        self._condition = threading.Condition()
+        self._unfinished: List[int] = []
+        self._waiting = set()
+        self._held: List[Dict] = []
+        self._embedding = False
+        self._failed: Optional[int] = None
+
+    @staticmethod
+    def route(embed: Callable, default_model: str = "text-embedding-3-small") -> Callable:
+        """Wrap an ``embed(input_text, model)`` function so calls made under ``map`` join the batch"""
+
+        @functools.wraps(embed)
+        def routed_embed(input_text, model=default_model):
+            active = _active_batch.get()
+            if active is None:
+                return embed(input_text, model)
+            batch, position = active
+            return batch.embed(position, input_text, model)
+
+        return routed_embed
+
+    def map(self, write: Callable[[Any], Any], items: List[Any]) -> List[Tuple[Any, Optional[Exception]]]:
+        """Run ``write(item)`` for every item at once, returning one ``(result, error)`` pair each"""
+        items = list(items)
+        if not items:
+            return []
+        with self._condition:
+            self._unfinished = list(range(len(items)))
+
+        def run(position, item):
+            _active_batch.set((self, position))
+            try:
+                return write(item), None
+            except Exception as e:
+                if not isinstance(e, WriteDeferred):
+                    with self._condition:
+                        if self._failed is None or position < self._failed:
+                            self._failed = position
+                return None, e
+            finally:
+                self._finish(position)
+
+        with ThreadPoolExecutor(max_workers=len(items), thread_name_prefix="nexus-memory-batch") as executor:
+            futures = [
+                # Each write gets its own copy of the caller's context, tracking ids included
+                executor.submit(contextvars.copy_context().run, run, position, item)
+                for position, item in enumerate(items)
+            ]
+            return [future.result() for future in futures]
+
+    def embed(self, position: int, input_text: str, model: str) -> Any:
+        """Embed a text for the write at ``position``, together with the other writes' texts"""
+        request = {"text": input_text, "model": model, "done": False, "vector": None, "error": None}
+        with self._condition:
+            self._held.append(request)
+            self._waiting.add(position)
+            try:
+                while not request["done"]:
+                    if not self._embedding and len(self._waiting) >= len(self._unfinished):
+                        self._embed_held_locked()
+                    else:
+                        self._condition.wait()
+                # The first unfinished write never waits here, so the batch always moves on
+                while self._unfinished[0] != position:
+                    self._condition.wait()
+                if self._failed is not None and self._failed < position:
+                    raise WriteDeferred(f"write {self._failed} of the batch failed")
+            finally:
+                self._waiting.discard(position)
+        if request["error"] is not None:
+            raise request["error"]
+        return request["vector"]
+
+    def _embed_held_locked(self):
+        held, self._held = self._held, []
+        by_model: Dict[str, List[Dict]] = {}
+        for request in held:
+            by_model.setdefault(request["model"], []).append(request)
+        self._embedding = True
+        self._condition.release()
+        try:
+            for model, requests in by_model.items():
+                try:
+                    vectors = list(self.embed_many([request["text"] for request in requests], model))
+                    if len(vectors) != len(requests):
+                        raise ValueError(f"expected {len(requests)} embeddings, got {len(vectors)}")
+                    for request, vector in zip(requests, vectors):
+                        request["vector"] = vector
+                except Exception as e:
+                    for request in requests:
+                        request["error"] = e
+        finally:
+            self._condition.acquire()
+            self._embedding = False
+            for request in held:
+                request["done"] = True
+            self.requests += len(by_model)
+            self.texts += len(held)
+            self._condition.notify_all()
+
+    def _finish(self, position: int):
+        with self._condition:
+            self._unfinished.remove(position)
+            self._condition.notify_all()
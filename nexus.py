@@ -1,16 +1,20 @@
-from datetime import datetime
-
-from peewee import *
-
-from nexus.nexus_base.action_manager import ActionManager
-from nexus.nexus_base.agent_manager import AgentManager
-from nexus.nexus_base.assistants_manager import AssistantsManager
+import contextvars
+import inspect
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta
+
+from peewee import ModelIndex, chunked, fn
+
+from nexus.nexus_base.agent_pool import copy_agent
+from nexus.nexus_base.database import WriteBatcher, configure_database
 from nexus.nexus_base.context_variables import (
     tracking_function_context,
     tracking_id_context,
 )
-from nexus.nexus_base.knowledge_manager import KnowledgeManager
-from nexus.nexus_base.memory_manager import MemoryManager
 from nexus.nexus_base.nexus_models import (
     ChatParticipants,
     Document,
@@ -23,32 +27,276 @@ from nexus.nexus_base.nexus_models import (
     Thread,
     db,
 )
-from nexus.nexus_base.profile_manager import ProfileManager
-from nexus.nexus_base.thought_template_manager import ThoughtTemplateManager
-from nexus.nexus_base.tracking_manager import TrackingManager
-from nexus.nexus_base.orchestration_manager import OrchestrationManager
+
+
+MESSAGE_THREAD_TIMESTAMP_INDEX = "message_thread_timestamp"
+SUBSCRIBER_PARTICIPANT_THREAD_INDEX = "subscriber_participant_thread"
+NOTIFICATION_PARTICIPANT_THREAD_INDEX = "notification_participant_thread"
+# Derived data that can be rebuilt goes to the user's cache directory, not the package
+USER_CACHE_DIR = os.path.join(
+    os.getenv("XDG_CACHE_HOME")
+    or os.getenv("LOCALAPPDATA")
+    or os.path.join(os.path.expanduser("~"), ".cache"),
+    "nexus",
+)
+DEFAULT_EMBEDDING_CACHE_PATH = os.path.join(USER_CACHE_DIR, "embedding_cache.db")
+DEFAULT_VECTOR_INDEX_PATH = os.path.join(USER_CACHE_DIR, "vector_index")
+# State that has to survive restarts, like queued memory writes, goes to the user's
+# state directory
+USER_STATE_DIR = os.path.join(
+    os.getenv("XDG_STATE_HOME")
+    or os.getenv("LOCALAPPDATA")
+    or os.path.join(os.path.expanduser("~"), ".local", "state"),
+    "nexus",
+)
+DEFAULT_MEMORY_JOURNAL_PATH = os.path.join(USER_STATE_DIR, "memory_journal.db")
+
+
+class _Subsystem:
+    """Nexus attribute built on first access and timed for the startup report.
+
+    The built value is stored on the instance under the same name, so later
+    lookups never reach the descriptor again. ``ready`` runs after the value
+    is stored, for setup that needs the attribute itself.
+    """
+
+    def __init__(self, build, ready=None):
+        self.build = build
+        self.ready = ready
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, nexus, owner=None):
+        if nexus is None:
+            return self
+        with nexus._subsystems_lock:
+            if self.name in nexus.__dict__:
+                # Another thread built it while this one waited
+                return nexus.__dict__[self.name]
+            return nexus._start_subsystem(self.name, self.build, self.ready)
 
 
 class Nexus:
-    def __init__(self):
-        self.tracking_manager = TrackingManager()
+    def __init__(self, database_url=None, write_batching=True, local_vector_index=None):
+        self._subsystems_lock = threading.RLock()
+        # Answer store queries from an in-process index instead of the vector store
+        if local_vector_index is None:
+            local_vector_index = os.getenv("NEXUS_VECTOR_INDEX", "").lower() == "local"
+        self.local_vector_index = local_vector_index
+        self._startup_times = {}
+        self._startup_stack = []
+
+        started = time.perf_counter()
+        configure_database(db, database_url or os.getenv("NEXUS_DATABASE_URL"))
+        self.write_batcher = WriteBatcher(db, enabled=write_batching)
+        self._startup_times["database"] = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        self.ensure_indexes()
+        self._startup_times["indexes"] = (time.perf_counter() - started) * 1000
+
+        self._participants_by_username = {}
+        self._participants_by_id = {}
+        self._participants_lock = threading.Lock()
+
+        journal_path = os.getenv(
+            "NEXUS_MEMORY_JOURNAL_PATH", DEFAULT_MEMORY_JOURNAL_PATH
+        )
+        if journal_path and os.path.exists(journal_path):
+            # Deliver writes an earlier run left in the journal now, in the
+            # background, rather than waiting for the next append_memory
+            threading.Thread(
+                target=self.warm_up,
+                args=(["memory_write_queue"],),
+                name="nexus-memory-replay",
+                daemon=True,
+            ).start()
 
-        self.agent_manager = AgentManager(self.tracking_manager)
-        self.load_agents()
+    # Managers are built on first use, importing their dependencies then
+    def _build_tracking_manager(self):
+        from nexus.nexus_base.tracking_manager import TrackingManager
 
-        self.assistants_manager = AssistantsManager()
+        return TrackingManager()
 
-        self.action_manager = ActionManager()
-        self.actions = self.load_actions()
+    def _build_notification_manager(self):
+        from nexus.nexus_base.notification_manager import NotificationManager
 
-        self.profile_manager = ProfileManager()
-        self.profiles = self.load_profiles()
+        return NotificationManager()
 
-        self.knowledge_manager = KnowledgeManager()
-        self.memory_manager = MemoryManager()
+    def _build_agent_manager(self):
+        from nexus.nexus_base.agent_manager import AgentManager
 
-        self.thought_template_manager = ThoughtTemplateManager(self)
-        self.orchestration_manager = OrchestrationManager(self)
+        return AgentManager(self.tracking_manager)
+
+    def _build_assistants_manager(self):
+        from nexus.nexus_base.assistants_manager import AssistantsManager
+
+        return AssistantsManager()
+
+    def _build_action_manager(self):
+        from nexus.nexus_base.action_manager import ActionManager
+
+        return ActionManager()
+
+    def _build_profile_manager(self):
+        from nexus.nexus_base.profile_manager import ProfileManager
+
+        return ProfileManager()
+
+    def _build_embedding_cache(self):
+        from nexus.nexus_base.embedding_cache import EmbeddingCache
+
+        # An empty NEXUS_EMBEDDING_CACHE_PATH keeps the cache in memory only
+        return EmbeddingCache(
+            path=os.getenv("NEXUS_EMBEDDING_CACHE_PATH", DEFAULT_EMBEDDING_CACHE_PATH)
+            or None
+        )
+
+    def _build_vector_index_manager(self):
+        from nexus.nexus_base.vector_index import VectorIndexManager
+
+        # An empty NEXUS_VECTOR_INDEX_PATH keeps the indexes in memory only
+        return VectorIndexManager(
+            os.getenv("NEXUS_VECTOR_INDEX_PATH", DEFAULT_VECTOR_INDEX_PATH) or None
+        )
+
+    def _build_memory_write_queue(self):
+        from nexus.nexus_base.memory_queue import MemoryWriteQueue
+
+        # An empty NEXUS_MEMORY_JOURNAL_PATH keeps queued writes in memory only
+        return MemoryWriteQueue(
+            self._write_memories,
+            path=os.getenv("NEXUS_MEMORY_JOURNAL_PATH", DEFAULT_MEMORY_JOURNAL_PATH)
+            or None,
+        )
+
+    def _build_knowledge_manager(self):
+        from nexus.nexus_base.knowledge_manager import KnowledgeManager
+
+        manager = KnowledgeManager()
+        # Shadow the method on the instance so the manager's own calls hit the cache too
+        manager.get_document_embedding = self.embedding_cache.wrap(
+            manager.get_document_embedding
+        )
+        return manager
+
+    def _build_memory_manager(self):
+        from nexus.nexus_base.memory_manager import MemoryManager
+        from nexus.nexus_base.memory_queue import EmbeddingBatch
+
+        manager = MemoryManager()
+        # Queued writes running together share embedding requests, see _write_memories
+        manager.get_memory_embedding = EmbeddingBatch.route(
+            self.embedding_cache.wrap(manager.get_memory_embedding)
+        )
+        return manager
+
+    def _build_thought_template_manager(self):
+        from nexus.nexus_base.thought_template_manager import ThoughtTemplateManager
+
+        return ThoughtTemplateManager(self)
+
+    def _build_thread_archive_manager(self):
+        from nexus.nexus_base.thread_archive import ThreadArchiveManager
+
+        return ThreadArchiveManager()
+
+    def _build_orchestration_manager(self):
+        from nexus.nexus_base.orchestration_manager import OrchestrationManager
+
+        return OrchestrationManager(self)
+
+    tracking_manager = _Subsystem(_build_tracking_manager)
+    notification_manager = _Subsystem(_build_notification_manager)
+    agent_manager = _Subsystem(
+        _build_agent_manager, ready=lambda nexus: nexus.load_agents()
+    )
+    assistants_manager = _Subsystem(_build_assistants_manager)
+    action_manager = _Subsystem(_build_action_manager)
+    profile_manager = _Subsystem(_build_profile_manager)
+    embedding_cache = _Subsystem(_build_embedding_cache)
+    vector_index_manager = _Subsystem(_build_vector_index_manager)
+    knowledge_manager = _Subsystem(_build_knowledge_manager)
+    memory_manager = _Subsystem(_build_memory_manager)
+    # Writes left over from an earlier run are queued again on first use
+    memory_write_queue = _Subsystem(
+        _build_memory_write_queue, ready=lambda nexus: nexus.memory_write_queue.replay()
+    )
+    thought_template_manager = _Subsystem(_build_thought_template_manager)
+    orchestration_manager = _Subsystem(_build_orchestration_manager)
+    thread_archive_manager = _Subsystem(_build_thread_archive_manager)
+    retrieval_executor = _Subsystem(
+        lambda nexus: ThreadPoolExecutor(
+            max_workers=16, thread_name_prefix="nexus-retrieval"
+        )
+    )
+    actions = _Subsystem(lambda nexus: nexus.load_actions())
+    profiles = _Subsystem(lambda nexus: nexus.load_profiles())
+
+    def _start_subsystem(self, name, build, ready=None):
+        """Build a subsystem, recording its own time excluding nested subsystems"""
+        started = time.perf_counter()
+        self._startup_stack.append(0.0)
+        try:
+            value = build(self)
+            self.__dict__[name] = value
+            if ready is not None:
+                ready(self)
+            return value
+        finally:
+            nested = self._startup_stack.pop()
+            elapsed = time.perf_counter() - started
+            if self._startup_stack:
+                self._startup_stack[-1] += elapsed
+            self._startup_times[name] = (elapsed - nested) * 1000
+
+    def warm_up(self, names=None):
+        """Build subsystems now instead of on first use, all of them by default"""
+        if names is None:
+            names = [
+                name
+                for name, attribute in vars(Nexus).items()
+                if isinstance(attribute, _Subsystem)
+            ]
+        for name in names:
+            getattr(self, name)
+
+    def get_database_stats(self):
+        """Get write batching counters and lock wait timings"""
+        return self.write_batcher.get_stats()
+
+    def get_startup_report(self):
+        """Milliseconds spent building each subsystem so far, in build order"""
+        with self._subsystems_lock:
+            subsystems = dict(self._startup_times)
+        return {
+            "subsystems_ms": subsystems,
+            "total_ms": sum(subsystems.values()),
+            "pending": [
+                name
+                for name, attribute in vars(Nexus).items()
+                if isinstance(attribute, _Subsystem) and name not in self.__dict__
+            ],
+        }
+
+    def ensure_indexes(self):
+        """Create the indexes the paginated and bulk queries rely on"""
+        indexes = [
+            (Message, (Message.thread, Message.timestamp), MESSAGE_THREAD_TIMESTAMP_INDEX),
+            (
+                Subscriber,
+                (Subscriber.participant, Subscriber.thread),
+                SUBSCRIBER_PARTICIPANT_THREAD_INDEX,
+            ),
+            (
+                Notification,
+                (Notification.participant, Notification.thread),
+                NOTIFICATION_PARTICIPANT_THREAD_INDEX,
+            ),
+        ]
+        for model, fields, name in indexes:
+            db.execute(ModelIndex(model, fields, name=name).safe(True))
 
     def get_orchestration_names(self):
         """Get all orchestration configuration names"""
@@ -62,26 +310,68 @@ class Nexus:
         """Set the active orchestration"""
         return self.orchestration_manager.set_active_orchestration(name)
 
+    def reload_orchestrations(self):
+        """Reload new or changed orchestration configurations"""
+        return self.orchestration_manager.reload_orchestrations()
+
     def get_active_orchestration(self):
         """Get the currently active orchestration"""
         return self.orchestration_manager.active_orchestration
 
     async def orchestrate_agent_request(self, user_input, thread_id=None):
         """Orchestrate a request across multiple agents"""
-        return await self.orchestration_manager.orchestrate_request(user_input, thread_id)
+        return await self.orchestration_manager.orchestrate_request_async(
+            user_input, thread_id
+        )
+
+    def orchestrate_agent_request_stream_async(
+        self, user_input, thread_id=None, progress_callback=None
+    ):
+        """Stream orchestrated response as an async generator"""
+        return self.orchestration_manager.orchestrate_request_stream_async(
+            user_input, thread_id, progress_callback
+        )
 
-    def orchestrate_agent_request_stream(self, user_input, thread_id=None):
+    def orchestrate_agent_request_stream(
+        self, user_input, thread_id=None, progress_callback=None
+    ):
         """Stream orchestrated response"""
-        return self.orchestration_manager.orchestrate_request_stream(user_input, thread_id)
+        return self.orchestration_manager.orchestrate_request_stream(
+            user_input, thread_id, progress_callback
+        )
 
-    def get_a2a_conversation_history(self):
-        """Get agent-to-agent conversation history"""
-        return self.orchestration_manager.get_conversation_history()
+    def execute_orchestration_flow(self, condition, inputs, progress_callback=None):
+        """Run a declared sequential_delegation flow over a batch of inputs"""
+        return self.orchestration_manager.execute_flow(
+            condition, inputs, progress_callback
+        )
+
+    def get_a2a_conversation_history(
+        self, page=0, page_size=20, thread_id=None, profile=None
+    ):
+        """Get a page of agent-to-agent conversation history, newest first"""
+        return self.orchestration_manager.get_conversation_history(
+            page, page_size, thread_id, profile
+        )
+
+    def count_a2a_conversation_history(self, thread_id=None, profile=None):
+        """Count agent-to-agent conversation history entries"""
+        return self.orchestration_manager.count_conversation_history(
+            thread_id, profile
+        )
 
     def clear_a2a_conversation_history(self):
         """Clear agent-to-agent conversation history"""
         return self.orchestration_manager.clear_conversation_history()
 
+    def get_response_cache_stats(self):
+        """Get hit/miss counters for the orchestration delegate response caches"""
+        return self.orchestration_manager.get_response_cache_stats()
+
+    def get_agent_pool_stats(self):
+        """Get hit/miss counters for the warm orchestration agent pool"""
+        return self.orchestration_manager.get_agent_pool_stats()
+
     def set_tracking_id(self, tracking_id):
         tracking_id_context.set(tracking_id)
 
@@ -95,9 +385,7 @@ class Nexus:
         return self.assistants_manager.list_assistants()
 
     def create_assistant(self, name, instructions, model, tools):
-        participant = (
-            ChatParticipants.select().where(ChatParticipants.username == name).first()
-        )
+        participant = self.get_participant(name)
         if not participant:
             self.add_participant(
                 name,
@@ -116,11 +404,7 @@ class Nexus:
 
     def retrieve_assistant(self, assistant_id):
         assistant = self.assistants_manager.retrieve_assistant(assistant_id)
-        participant = (
-            ChatParticipants.select()
-            .where(ChatParticipants.username == assistant.name)
-            .first()
-        )
+        participant = self.get_participant(assistant.name)
         if not participant:
             self.add_participant(
                 assistant.name,
@@ -161,12 +445,13 @@ class Nexus:
         agents = self.agent_manager.get_agent_names()
         avatars = ["🤖", "🧠", "🧮", "⚙️", "🔮"]  # more than 5 agents add more icons
         avatars.reverse()  # better emojis at the start
+        # One query warms the participant cache for every agent
+        for participant in ChatParticipants.select().where(
+            ChatParticipants.username.in_(agents)
+        ):
+            self._cache_participant(participant)
         for agent in agents:
-            participant = (
-                ChatParticipants.select()
-                .where(ChatParticipants.username == agent)
-                .first()
-            )
+            participant = self.get_participant(agent)
             if not participant:
                 self.add_participant(
                     agent,
@@ -223,13 +508,41 @@ class Nexus:
                 avatar=avatar,
             )
             print(f"Participant '{username}' added.")
-            return True
+        self._invalidate_participant(username)
+        return True
 
     def get_participant(self, username):
+        participant = self._participants_by_username.get(username)
+        if participant is not None:
+            return participant
+        try:
+            participant = ChatParticipants.get(ChatParticipants.username == username)
+        except ChatParticipants.DoesNotExist:
+            return None
+        self._cache_participant(participant)
+        return participant
+
+    def get_participant_by_id(self, user_id):
+        participant = self._participants_by_id.get(user_id)
+        if participant is not None:
+            return participant
         try:
-            return ChatParticipants.get(ChatParticipants.username == username)
+            participant = ChatParticipants.get(ChatParticipants.user_id == user_id)
         except ChatParticipants.DoesNotExist:
             return None
+        self._cache_participant(participant)
+        return participant
+
+    def _cache_participant(self, participant):
+        with self._participants_lock:
+            self._participants_by_username[participant.username] = participant
+            self._participants_by_id[participant.user_id] = participant
+
+    def _invalidate_participant(self, username):
+        with self._participants_lock:
+            participant = self._participants_by_username.pop(username, None)
+            if participant is not None:
+                self._participants_by_id.pop(participant.user_id, None)
 
     def get_all_participants(self):
         users = ChatParticipants.select()
@@ -245,6 +558,91 @@ class Nexus:
             Subscriber.create(participant=participant_id, thread=thread)
             return thread
 
+    def create_threads(self, threads, type="agent"):
+        """Create many threads with their subscribers in one transaction.
+
+        ``threads`` is an iterable of (title, participant_ids) pairs; as with
+        create_thread the title is the thread id unless ``type`` is
+        "assistants". Threads that already exist are skipped but still get
+        any missing subscribers. Returns created and skipped counts.
+        """
+        threads = [(title, list(participant_ids)) for title, participant_ids in threads]
+        rows = []
+        pairs = []
+        for title, participant_ids in threads:
+            thread_id = title
+            if type == "assistants":
+                thread_id = self.assistants_manager.create_thread().id
+            rows.append({"thread_id": thread_id, "title": title, "type": type})
+            pairs.extend((thread_id, participant_id) for participant_id in participant_ids)
+
+        def create():
+            requested = list(dict.fromkeys(row["thread_id"] for row in rows))
+            existing = set()
+            for batch in chunked(requested, 500):
+                existing.update(
+                    thread_id
+                    for (thread_id,) in Thread.select(Thread.thread_id)
+                    .where(Thread.thread_id.in_(batch))
+                    .tuples()
+                )
+            new_rows = list(
+                {
+                    row["thread_id"]: row for row in rows if row["thread_id"] not in existing
+                }.values()
+            )
+            for batch in chunked(new_rows, 100):
+                Thread.insert_many(batch).on_conflict_ignore().execute()
+            subscriptions = self._insert_subscriptions(pairs)
+            return {
+                "threads_created": len(new_rows),
+                "threads_skipped": len(rows) - len(new_rows),
+                **subscriptions,
+            }
+
+        return self.write_batcher.run(create)
+
+    def subscribe_many(self, thread_ids, participant_ids):
+        """Subscribe every participant to every thread, skipping existing subscriptions.
+
+        Returns created and skipped counts.
+        """
+        pairs = [
+            (thread_id, participant_id)
+            for thread_id in thread_ids
+            for participant_id in participant_ids
+        ]
+        return self.write_batcher.run(lambda: self._insert_subscriptions(pairs))
+
+    def _insert_subscriptions(self, pairs):
+        """Insert (thread_id, participant_id) subscriptions that do not exist yet"""
+        requested = list(dict.fromkeys(pairs))
+        existing = set()
+        thread_ids = list({thread_id for thread_id, _ in requested})
+        participant_ids = list({participant_id for _, participant_id in requested})
+        # Both IN lists are chunked so a query stays under SQLite's 999 parameters
+        for thread_batch in chunked(thread_ids, 400):
+            for participant_batch in chunked(participant_ids, 400):
+                existing.update(
+                    Subscriber.select(Subscriber.thread, Subscriber.participant)
+                    .where(
+                        Subscriber.thread.in_(thread_batch)
+                        & Subscriber.participant.in_(participant_batch)
+                    )
+                    .tuples()
+                )
+        rows = [
+            {"thread": thread_id, "participant": participant_id}
+            for thread_id, participant_id in requested
+            if (thread_id, participant_id) not in existing
+        ]
+        for batch in chunked(rows, 100):
+            Subscriber.insert_many(batch).on_conflict_ignore().execute()
+        return {
+            "subscriptions_created": len(rows),
+            "subscriptions_skipped": len(pairs) - len(rows),
+        }
+
     def get_all_threads(self):
         return Thread.select()
 
@@ -252,7 +650,7 @@ class Nexus:
         return Thread.get(Thread.thread_id == thread_id)
 
     def subscribe_to_thread(self, thread_id, participant_id):
-        with db.atomic():
+        def subscribe():
             if (
                 not Subscriber.select()
                 .where(
@@ -267,6 +665,8 @@ class Nexus:
                     f"Participant {participant_id} is already subscribed to thread {thread_id}."
                 )
 
+        self.write_batcher.run(subscribe)
+
     def leave_thread(self, thread_id, participant_id):
         with db.atomic():
             query = Subscriber.delete().where(
@@ -275,7 +675,7 @@ class Nexus:
             query.execute()
 
     def post_message(self, thread_id, participant_id, role, content):
-        with db.atomic():
+        def post():
             message = Message.create(
                 thread=thread_id,
                 author=participant_id,
@@ -283,45 +683,258 @@ class Nexus:
                 role=role,
                 timestamp=datetime.now(),
             )
-            subscribers = Subscriber.select().where(Subscriber.thread == thread_id)
-            for subscriber in subscribers:
-                if subscriber.participant.user_id != participant_id:
-                    Notification.create(
-                        participant=subscriber.participant,
-                        thread=thread_id,
-                        message=message,
-                    )
+            self._notify_subscribers([(message.id, thread_id, participant_id)])
+            return message
+
+        return self.write_batcher.run(post)
+
+    def post_messages(self, messages):
+        """Post many (thread_id, participant_id, role, content) messages at once.
+
+        All messages and their notifications are written in one transaction,
+        with a single subscriber query and bulk notification inserts.
+        Returns the ids of the new messages in input order.
+        """
+        message_ids = []
+        posted = []
+
+        def post():
+            for thread_id, participant_id, role, content in messages:
+                message_id = Message.insert(
+                    thread=thread_id,
+                    author=participant_id,
+                    content=content,
+                    role=role,
+                    timestamp=datetime.now(),
+                ).execute()
+                message_ids.append(message_id)
+                posted.append((message_id, thread_id, participant_id))
+            self._notify_subscribers(posted)
+
+        self.write_batcher.run(post)
+        return message_ids
+
+    def _notify_subscribers(self, posted):
+        """Create notifications for (message_id, thread_id, author_id) tuples.
+
+        Every subscriber of each thread except the author gets one; the
+        subscribers of all threads come from one joined query.
+        """
+        if not posted:
+            return 0
+        thread_ids = {thread_id for _, thread_id, _ in posted}
+        subscribers = (
+            Subscriber.select(Subscriber.thread, Subscriber.participant, ChatParticipants.user_id)
+            .join(ChatParticipants)
+            .where(Subscriber.thread.in_(list(thread_ids)))
+            .tuples()
+        )
+        subscribers_by_thread = {}
+        for thread_id, participant, user_id in subscribers:
+            subscribers_by_thread.setdefault(thread_id, []).append((participant, user_id))
+
+        rows = [
+            {"participant": participant, "thread": thread_id, "message": message_id}
+            for message_id, thread_id, author_id in posted
+            for participant, user_id in subscribers_by_thread.get(thread_id, [])
+            if user_id != author_id
+        ]
+        for batch in chunked(rows, 100):
+            Notification.insert_many(batch).execute()
+        return len(rows)
 
     def read_messages(self, thread_id):
+        """Read a whole thread, archived messages included, oldest first"""
+        archived = self.thread_archive_manager.count_archived(thread_id)
         return (
-            Message.select()
+            self.thread_archive_manager.read_before(thread_id, archived)
+            if archived
+            else []
+        ) + list(
+            Message.select(Message, ChatParticipants)
+            .join(ChatParticipants)
             .where(Message.thread == thread_id)
-            .order_by(Message.timestamp.asc())
+            .order_by(Message.timestamp.asc(), Message.id.asc())
+        )
+
+    def read_messages_page(self, thread_id, limit=50, before_id=None, since_id=None):
+        """Read part of a thread with keyset pagination, oldest first.
+
+        With no cursor this is the last ``limit`` messages. ``before_id``
+        gives up to ``limit`` messages just before that message, for scrolling
+        back; ``since_id`` gives the messages after it (``limit=None`` for all),
+        for fetching only what is new since the last read.
+        """
+        # Authors are joined in so rendering a page needs no extra queries
+        query = (
+            Message.select(Message, ChatParticipants)
+            .join(ChatParticipants)
+            .where(Message.thread == thread_id)
+        )
+        cursor_message = Message.alias()
+
+        if since_id is not None:
+            cursor = (
+                Message.select(Message.timestamp)
+                .where(Message.id == since_id)
+                .scalar()
+            )
+            if cursor is None:
+                # The last message read has since been archived
+                cursor = self.thread_archive_manager.get_message_timestamp(
+                    thread_id, since_id
+                )
+            if cursor is None:
+                query = query.where(Message.id > since_id)
+            else:
+                query = query.where(
+                    (Message.timestamp > cursor)
+                    | ((Message.timestamp == cursor) & (Message.id > since_id))
+                )
+            query = query.order_by(Message.timestamp.asc(), Message.id.asc())
+            if limit:
+                query = query.limit(limit)
+            return list(query)
+
+        if before_id is not None:
+            cursor = cursor_message.select(cursor_message.timestamp).where(
+                cursor_message.id == before_id
+            )
+            query = query.where(
+                (Message.timestamp < cursor)
+                | ((Message.timestamp == cursor) & (Message.id < before_id))
+            )
+        query = query.order_by(Message.timestamp.desc(), Message.id.desc()).limit(limit)
+        page = list(reversed(list(query)))
+        if len(page) < limit:
+            # Older messages may have been archived, read on into the archive
+            page = (
+                self.thread_archive_manager.read_before(
+                    thread_id, limit - len(page), None if page else before_id
+                )
+                + page
+            )
+        return page
+
+    def archive_thread(
+        self, thread_id, keep_last=None, older_than_days=None, chat_agent=None
+    ):
+        """Move a thread's old messages into compressed archive segments.
+
+        Messages beyond the last ``keep_last`` or older than
+        ``older_than_days`` are archived. With a ``chat_agent`` each segment
+        also gets a summary written by that agent. Archived messages are still
+        returned by read_messages_page when scrolling back.
+        """
+        older_than = timedelta(days=older_than_days) if older_than_days else None
+        summarize = self._summarize_messages(chat_agent) if chat_agent else None
+        self.set_tracking_function("thread:archive")
+        try:
+            return self.thread_archive_manager.archive_thread(
+                thread_id, keep_last, older_than, summarize
+            )
+        finally:
+            self.set_tracking_function("Not Set")
+
+    def archive_threads(self, keep_last=None, older_than_days=None, chat_agent=None):
+        """Archive every thread with messages past the limits, by thread id"""
+        thread_ids = set()
+        if keep_last is not None:
+            thread_ids.update(
+                self.thread_archive_manager.get_archivable_threads(keep_last)
+            )
+        if older_than_days:
+            cutoff = datetime.now() - timedelta(days=older_than_days)
+            thread_ids.update(
+                thread_id
+                for (thread_id,) in Message.select(Message.thread)
+                .where(Message.timestamp < cutoff)
+                .distinct()
+                .tuples()
+            )
+        archived = {}
+        for thread_id in sorted(thread_ids):
+            count = self.archive_thread(thread_id, keep_last, older_than_days, chat_agent)
+            if count:
+                archived[thread_id] = count
+        return archived
+
+    def get_thread_summary(self, thread_id):
+        """Get the summaries of a thread's archived messages, or None"""
+        summaries = self.thread_archive_manager.get_summaries(thread_id)
+        return "\n\n".join(summaries) if summaries else None
+
+    def count_archived_messages(self, thread_id):
+        return self.thread_archive_manager.count_archived(thread_id)
+
+    def _summarize_messages(self, chat_agent):
+        """Build an archive summarizer that asks the agent to condense a segment"""
+
+        def summarize(rows):
+            transcript = "\n".join(
+                f"{row['role']} ({row['author']}): {row['content']}" for row in rows
+            )
+            prompt = (
+                "Summarize the following conversation excerpt. Keep the facts, "
+                "decisions and open questions a participant would need later.\n\n"
+                f"{transcript}"
+            )
+            return "".join(chat_agent.get_response_stream(prompt)())
+
+        return summarize
+
+    def get_user_notifications(self, participant_id, unread_only=False):
+        return self.notification_manager.get_notifications(participant_id, unread_only)
+
+    def mark_notifications_read(self, participant_id, thread_id=None, up_to_message_id=None):
+        return self.notification_manager.mark_read(
+            participant_id, thread_id, up_to_message_id
+        )
+
+    def delete_notifications(self, participant_id, thread_id=None, up_to_message_id=None):
+        return self.notification_manager.delete(
+            participant_id, thread_id, up_to_message_id
         )
 
-    def get_user_notifications(self, participant_id):
-        return Notification.select().where(Notification.participant == participant_id)
+    def get_unread_notification_count(self, participant_id, thread_id=None):
+        return self.notification_manager.get_unread_count(participant_id, thread_id)
+
+    def compact_notifications(self):
+        """Delete notifications the participants have already read"""
+        return self.notification_manager.compact()
 
     def get_threads_for_user(self, participant_id, type="agent"):
+        """Get a participant's threads of one type in a single query.
+
+        Each thread also carries ``last_message_at`` (None for an empty
+        thread) and ``unread_count`` for the participant.
+        """
+        last_message_at = Message.select(fn.MAX(Message.timestamp)).where(
+            Message.thread == Thread.thread_id
+        )
+        unread_count = self.notification_manager.unread_query(
+            participant_id, Thread.thread_id
+        )
         query = (
-            Thread.select()
+            Thread.select(
+                Thread,
+                last_message_at.alias("last_message_at"),
+                unread_count.alias("unread_count"),
+            )
             .join(Subscriber)
-            .where(Subscriber.participant == participant_id and Thread.type == type)
+            .where((Subscriber.participant == participant_id) & (Thread.type == type))
             .order_by(Thread.timestamp.desc())
         )
         return list(query.execute())
 
     def login(self, username, password_hash):
-        participant = (
-            ChatParticipants.select()
-            .where(ChatParticipants.username == username)
-            .first()
-        )
+        participant = self.get_participant(username)
         if participant:
             # In a real application, compare hashed passwords instead
             if participant.password_hash == password_hash:
                 participant.status = "Active"
                 participant.save()
+                self._invalidate_participant(username)
                 print(f"{username} logged in successfully.")
                 return True
             else:
@@ -332,14 +945,11 @@ class Nexus:
             return False
 
     def logout(self, username):
-        participant = (
-            ChatParticipants.select()
-            .where(ChatParticipants.username == username)
-            .first()
-        )
+        participant = self.get_participant(username)
         if participant:
             participant.status = "Inactive"
             participant.save()
+            self._invalidate_participant(username)
             print(f"{username} logged out successfully.")
         else:
             print("Username not found.")
@@ -408,6 +1018,7 @@ class Nexus:
     def delete_knowledge_store(self, store_name):
         """Delete an existing knowledge store."""
         self.knowledge_manager.delete_knowledge_store(store_name)
+        self.refresh_vector_index(store_name)
         with db.atomic():
             query = KnowledgeStore.delete().where(KnowledgeStore.name == store_name)
             return query.execute()  # Returns the number of rows deleted
@@ -432,7 +1043,9 @@ class Nexus:
                 query = Document.delete().where(
                     (Document.store == store) & (Document.name == document_name)
                 )
-                return query.execute()  # Returns the number of rows deleted
+                deleted = query.execute()  # Returns the number of rows deleted
+                self.refresh_vector_index(store_name)
+                return deleted
             except KnowledgeStore.DoesNotExist:
                 return False  # Store does not exist
 
@@ -450,14 +1063,178 @@ class Nexus:
         return self.knowledge_manager.get_document_embedding(input_text, model)
 
     def query_documents(self, knowledge_store, query, n_results=5):
+        if self.local_vector_index:
+            results = self._query_local_index(
+                "knowledge", knowledge_store, [query], n_results
+            )
+            if results is not None:
+                return results
         return self.knowledge_manager.query_documents(knowledge_store, query, n_results)
 
+    def query_documents_many(self, knowledge_store, queries, n_results=5):
+        """Query a knowledge store with several texts, one result list per query"""
+        queries = list(queries)
+        if self.local_vector_index:
+            results = self._query_local_index(
+                "knowledge", knowledge_store, queries, n_results
+            )
+            if results is not None:
+                return results
+        return self._merge_query_results(
+            self.retrieval_executor.map(
+                lambda query: self.knowledge_manager.query_documents(
+                    knowledge_store, query, n_results
+                ),
+                queries,
+            )
+        )
+
     def get_documents(self, knowledge_store, include=["documents", "embeddings"]):
         return self.knowledge_manager.get_documents(knowledge_store, include)
 
     def load_document(self, knowledge_store, uploaded_file):
-        knowledge_store = KnowledgeStore.get(KnowledgeStore.name == knowledge_store)
-        return self.knowledge_manager.load_document(knowledge_store, uploaded_file)
+        store = KnowledgeStore.get(KnowledgeStore.name == knowledge_store)
+        try:
+            return self.knowledge_manager.load_document(store, uploaded_file)
+        finally:
+            self.refresh_vector_index(knowledge_store)
+
+    def load_documents(
+        self,
+        knowledge_store,
+        uploaded_files,
+        progress_callback=None,
+        batch_size=64,
+        max_workers=4,
+        model="text-embedding-3-small",
+    ):
+        """Load many documents into a knowledge store with batched embeddings.
+
+        When the knowledge manager can split a file into chunks
+        (``split_document(store, file)``) and store embedded chunks
+        (``add_document_chunks(store, name, chunks, embeddings, start)``),
+        documents go through a DocumentIngestor: chunks are embedded
+        ``batch_size`` at a time by ``max_workers`` workers while other files
+        are still being split and earlier batches written. Otherwise each file
+        goes to the manager's load_document, ``max_workers`` at a time, so the
+        manager keeps its own chunking, ids and metadata. Returns one result
+        dict per file with ``document``, ``chunks``, ``written`` and ``error``;
+        ``progress_callback`` receives the ingestion progress events.
+        """
+        from nexus.nexus_base.document_ingestion import DocumentIngestor
+
+        store = KnowledgeStore.get(KnowledgeStore.name == knowledge_store)
+        manager = self.knowledge_manager
+        uploaded_files = list(uploaded_files)
+        self.set_tracking_function("knowledge:load")
+        try:
+            if not (
+                hasattr(manager, "split_document")
+                and hasattr(manager, "add_document_chunks")
+            ):
+                return self._load_documents_per_file(
+                    store, uploaded_files, progress_callback, max_workers
+                )
+
+            ingestor = DocumentIngestor(
+                split=lambda file: (
+                    getattr(file, "name", str(file)),
+                    manager.split_document(store, file),
+                ),
+                embed_batch=lambda texts: self._embed_documents(
+                    texts, model, max_workers
+                ),
+                write=lambda name, start, chunks, vectors: manager.add_document_chunks(
+                    store, name, chunks, vectors, start
+                ),
+                batch_size=batch_size,
+                parse_workers=min(max_workers, max(1, len(uploaded_files))),
+                embed_workers=max_workers,
+            )
+            return ingestor.ingest(uploaded_files, progress_callback)
+        finally:
+            self.set_tracking_function("Not Set")
+            self.refresh_vector_index(knowledge_store)
+
+    def _embed_documents(self, texts, model, max_workers):
+        """Embed a batch of chunks, asking the model only for uncached texts"""
+        return self._embed_texts(
+            self.knowledge_manager,
+            "get_document_embedding",
+            "get_document_embeddings",
+            texts,
+            model,
+            max_workers,
+        )
+
+    def _embed_texts(
+        self, manager, embed_name, embed_many_name, texts, model, max_workers
+    ):
+        """Embed texts through a manager, asking the model only for uncached texts"""
+        vectors = self.embedding_cache.get_many(model, texts)
+        missing = [index for index, vector in enumerate(vectors) if vector is None]
+        if not missing:
+            return vectors
+
+        missing_texts = [texts[index] for index in missing]
+        embed_many = getattr(manager, embed_many_name, None)
+        client = getattr(manager, "client", None)
+        if embed_many is not None:
+            embedded = list(embed_many(missing_texts, model))
+        elif hasattr(getattr(client, "embeddings", None), "create"):
+            # OpenAI-style client, the embeddings endpoint takes a list of inputs
+            response = client.embeddings.create(input=missing_texts, model=model)
+            embedded = [
+                item.embedding for item in sorted(response.data, key=lambda d: d.index)
+            ]
+        else:
+            # No batch endpoint, so embed the batch concurrently with the uncached call
+            embed = inspect.unwrap(getattr(manager, embed_name))
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                embedded = list(
+                    executor.map(lambda text: embed(text, model), missing_texts)
+                )
+
+        embedded = self.embedding_cache.set_many(model, zip(missing_texts, embedded))
+        for index, vector in zip(missing, embedded):
+            vectors[index] = vector
+        return vectors
+
+    def _load_documents_per_file(
+        self, store, uploaded_files, progress_callback, max_workers
+    ):
+        """Load whole files through load_document, several at a time"""
+
+        def load(index, uploaded_file):
+            name = getattr(uploaded_file, "name", str(uploaded_file))
+            result = {"document": name, "chunks": None, "written": None, "error": None}
+            try:
+                self.knowledge_manager.load_document(store, uploaded_file)
+            except Exception as e:
+                result["error"] = str(e)
+            if progress_callback is not None:
+                try:
+                    progress_callback(
+                        {
+                            "stage": "written",
+                            "document": name,
+                            "index": index,
+                            "chunks": None,
+                            "written": None,
+                        }
+                    )
+                except Exception as e:
+                    print(f"Error in ingestion progress callback: {str(e)}")
+            return result
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run, load, index, uploaded_file
+                )
+                for index, uploaded_file in enumerate(uploaded_files)
+            ]
+            return [future.result() for future in futures]
 
     def examine_documents(self, knowledge_store):
         return self.knowledge_manager.examine_documents(knowledge_store)
@@ -477,23 +1254,101 @@ class Nexus:
     def get_memory_embedding(self, input_text, model="text-embedding-3-small"):
         return self.memory_manager.get_memory_embedding(input_text, model)
 
+    def get_embedding_cache_stats(self):
+        """Get hit/miss counters and sizes of the shared embedding cache"""
+        return self.embedding_cache.get_stats()
+
     def query_memories(self, memory_store, query, n_results=5):
+        if self.local_vector_index:
+            results = self._query_local_index(
+                "memory", memory_store, [query], n_results
+            )
+            if results is not None:
+                return results
         return self.memory_manager.query_memories(memory_store, query, n_results)
 
+    def query_memories_many(self, memory_store, queries, n_results=5):
+        """Query a memory store with several texts, one result list per query"""
+        queries = list(queries)
+        if self.local_vector_index:
+            results = self._query_local_index(
+                "memory", memory_store, queries, n_results
+            )
+            if results is not None:
+                return results
+        return self._merge_query_results(
+            self.retrieval_executor.map(
+                lambda query: self.memory_manager.query_memories(
+                    memory_store, query, n_results
+                ),
+                queries,
+            )
+        )
+
+    def refresh_vector_index(self, store_name, kind="knowledge"):
+        """Drop a store's local index so the next query rebuilds it.
+
+        Writes made through Nexus do this already; call it after changing a
+        store's vectors some other way.
+        """
+        if self.local_vector_index:
+            self.vector_index_manager.invalidate(kind, store_name)
+
+    def _query_local_index(self, kind, store_name, queries, n_results):
+        """Query the local index, or return None to fall back to the vector store"""
+        if kind == "knowledge":
+            embed = self.get_document_embedding
+            get = self.get_documents
+        else:
+            embed = self.get_memory_embedding
+            get = self.get_memories
+        load = lambda: get(store_name, include=["documents", "embeddings", "metadatas"])
+        # Ids alone are enough to check a saved index against the store
+        load_ids = lambda: (get(store_name, include=[]) or {}).get("ids") or []
+        try:
+            if len(queries) == 1:
+                embeddings = [embed(queries[0])]
+            else:
+                embeddings = list(self.retrieval_executor.map(embed, queries))
+            return self.vector_index_manager.query(
+                kind, store_name, embeddings, n_results, load, load_ids
+            )
+        except ImportError as e:
+            print(f"Local vector index disabled: {str(e)}")
+            self.local_vector_index = False
+        except Exception as e:
+            print(f"Error querying local {kind} index for {store_name}: {str(e)}")
+        return None
+
+    def _merge_query_results(self, results):
+        """Combine single-query vector store results into one batched result"""
+        merged = {}
+        for result in results:
+            for key, value in (result or {}).items():
+                if isinstance(value, list):
+                    merged.setdefault(key, []).extend(value)
+        return merged
+
     def get_memories(self, memory_store, include=["documents", "embeddings"]):
         return self.memory_manager.get_memories(memory_store, include)
 
-    def load_memory(self, memory_store, memory, agent):
+    def load_memory(self, memory_store, memory, agent, wait=True):
+        """Load a memory into a store through the memory write queue.
+
+        With ``wait=False`` this returns a Future straight away and the write
+        happens in the background, after earlier writes to the same store.
+        """
         if memory_store is None or memory is None:
             return None
-        memory_store = MemoryStore.get(MemoryStore.name == memory_store)
-        memory_function = self.get_memory_function(memory_store.memory_type)
-        self.set_tracking_function("memory:load")
-        result = self.memory_manager.append_memory(
-            memory_store, memory, None, memory_function, agent
+        future = self.memory_write_queue.submit(
+            memory_store,
+            "load",
+            memory,
+            None,
+            self._snapshot_agent(agent),
+            tracking_id_context.get(None),
         )
-        self.set_tracking_function("Not Set")
-        return result
+        return future.result() if wait else future
 
     def examine_memories(self, memory_store):
         return self.memory_manager.examine_memories(memory_store)
@@ -501,8 +1356,9 @@ class Nexus:
     def apply_memory_RAG(self, memory_store, input_text, agent, n_results=5):
         if memory_store is None or memory_store == "None" or input_text is None:
             return ""
-        memory_store = MemoryStore.get(MemoryStore.name == memory_store)
-        memory_function = self.get_memory_function(memory_store.memory_type)
+        memory_store, memory_function = self._get_memory_store_and_function(
+            memory_store
+        )
         self.set_tracking_function("memory:augment")
         result = self.memory_manager.apply_memory_RAG(
             memory_store, memory_function, input_text, agent, n_results
@@ -529,21 +1385,178 @@ class Nexus:
             memory_store.save()
             return True
 
-    def append_memory(self, memory_store, user_input, llm_response, agent):
+    def append_memory(self, memory_store, user_input, llm_response, agent, wait=True):
+        """Append a chat turn to a memory store through the memory write queue.
+
+        With ``wait=False`` this returns a Future straight away and the write
+        happens in the background, after earlier writes to the same store.
+        """
         if memory_store is None or user_input is None:
             return None
-        memory_store = MemoryStore.get(MemoryStore.name == memory_store)
-        memory_function = self.get_memory_function(memory_store.memory_type)
-        self.set_tracking_function("memory:append")
-        result = self.memory_manager.append_memory(
-            memory_store, user_input, llm_response, memory_function, agent
+        future = self.memory_write_queue.submit(
+            memory_store,
+            "append",
+            user_input,
+            llm_response,
+            self._snapshot_agent(agent),
+            tracking_id_context.get(None),
         )
-        self.set_tracking_function("Not Set")
-        return result
+        return future.result() if wait else future
+
+    def _snapshot_agent(self, agent):
+        """Copy an agent for a queued write, the caller keeps using the original"""
+        return copy_agent(agent) if agent is not None else None
+
+    def flush_memory_writes(self, timeout=None):
+        """Wait for queued memory writes, False if ``timeout`` seconds ran out first"""
+        return self.memory_write_queue.flush(timeout)
+
+    def close_memory_writes(self, timeout=None):
+        """Drain the memory write queue and stop its workers, for shutdown"""
+        if "memory_write_queue" not in self.__dict__:
+            return True
+        return self.memory_write_queue.close(timeout)
+
+    def get_memory_write_stats(self):
+        """Get counters for the memory write queue"""
+        return self.memory_write_queue.get_stats()
+
+    def _write_memories(self, store_name, entries):
+        """Write a batch of queued memory entries for one store, in order.
+
+        With more than one entry the writes run side by side under an
+        EmbeddingBatch, so their turns are extracted concurrently and their
+        embeddings are requested together.
+        """
+        from nexus.nexus_base.memory_queue import EmbeddingBatch
+
+        memory_store, memory_function = self._get_memory_store_and_function(
+            store_name
+        )
+
+        def write(entry):
+            agent = entry["agent"]
+            if agent is None and entry["agent_name"]:
+                # Replayed from the journal, the agent has to be looked up again
+                agent = self.get_agent(entry["agent_name"])
+            self.set_tracking_id(entry["tracking_id"] or "Not Set")
+            self.set_tracking_function(f"memory:{entry['kind']}")
+            try:
+                return self.memory_manager.append_memory(
+                    memory_store,
+                    entry["user_input"],
+                    entry["llm_response"],
+                    memory_function,
+                    agent,
+                )
+            finally:
+                self.set_tracking_function("Not Set")
+                self.set_tracking_id("Not Set")
+
+        if len(entries) > 1:
+            batch = EmbeddingBatch(
+                lambda texts, model: self._embed_texts(
+                    self.memory_manager,
+                    "get_memory_embedding",
+                    "get_memory_embeddings",
+                    texts,
+                    model,
+                    len(texts),
+                )
+            )
+            outcomes = batch.map(write, entries)
+        else:
+            outcomes = []
+            for entry in entries:
+                try:
+                    outcomes.append((write(entry), None))
+                except Exception as e:
+                    outcomes.append((None, e))
+        if any(error is None for _, error in outcomes):
+            self.refresh_vector_index(store_name, "memory")
+        return outcomes
 
     def get_memory_function(self, memory_type):
         return MemoryFunction.get(MemoryFunction.memory_type == memory_type)
 
+    def _get_memory_store_and_function(self, store_name):
+        """Get a memory store and its memory function with one joined query"""
+        memory_store = (
+            MemoryStore.select(MemoryStore, MemoryFunction)
+            .join(
+                MemoryFunction,
+                on=(MemoryFunction.memory_type == MemoryStore.memory_type),
+                attr="memory_function",
+            )
+            .where(MemoryStore.name == store_name)
+            .get()
+        )
+        return memory_store, memory_store.memory_function
+
+    def retrieve_context(
+        self,
+        knowledge_store,
+        memory_store,
+        input_text,
+        agent,
+        n_results=5,
+        knowledge_timeout=10.0,
+        memory_timeout=10.0,
+    ):
+        """Run knowledge and memory RAG concurrently and merge their augmentation.
+
+        Each source gets its own timeout in seconds, counted from the start;
+        a source that misses it, or fails, contributes nothing and the other
+        one is still used. The text is knowledge first, then memory, as when
+        the two are applied one after the other.
+        """
+        sources = []
+        if knowledge_store not in (None, "None"):
+            sources.append(
+                (
+                    "knowledge",
+                    knowledge_timeout,
+                    lambda: self.apply_knowledge_RAG(
+                        knowledge_store, input_text, n_results
+                    ),
+                )
+            )
+        if memory_store not in (None, "None"):
+            sources.append(
+                (
+                    "memory",
+                    memory_timeout,
+                    lambda: self.apply_memory_RAG(
+                        memory_store, input_text, agent, n_results
+                    ),
+                )
+            )
+        if input_text is None or not sources:
+            return ""
+
+        started = time.monotonic()
+        # Copy the context so the tracking id follows each lookup
+        futures = [
+            (
+                name,
+                timeout,
+                self.retrieval_executor.submit(contextvars.copy_context().run, retrieve),
+            )
+            for name, timeout, retrieve in sources
+        ]
+        augmentation = []
+        for name, timeout, future in futures:
+            remaining = None
+            if timeout is not None:
+                remaining = max(0.0, timeout - (time.monotonic() - started))
+            try:
+                augmentation.append(future.result(timeout=remaining) or "")
+            except FutureTimeoutError:
+                print(f"{name} retrieval timed out after {timeout}s, continuing without it.")
+            except Exception as e:
+                print(f"Error during {name} retrieval: {str(e)}")
+        return "".join(augmentation)
+
     def compress_memories(self, memory_store, grouped_memories, chat_agent):
         if memory_store is None or grouped_memories is None:
             return None
@@ -554,6 +1567,7 @@ class Nexus:
             memory_store, grouped_memories, memory_function, chat_agent
         )
         self.set_tracking_function("Not Set")
+        self.refresh_vector_index(memory_store.name, "memory")
         return result
 
     def compress_knowledge(self, knowledge_store, grouped_documents, chat_agent):
@@ -565,6 +1579,7 @@ class Nexus:
             knowledge_store, grouped_documents, chat_agent
         )
         self.set_tracking_function("Not Set")
+        self.refresh_vector_index(knowledge_store.name)
         return result
 
     def get_tracking_usage(self):
@@ -0,0 +1,182 @@
+import threading
+from datetime import datetime
+
+from peewee import (
+    EXCLUDED,
+    JOIN,
+    Case,
+    DateTimeField,
+    ForeignKeyField,
+    IntegerField,
+    Model,
+    Value,
+    fn,
+)
+
+from nexus.nexus_base.nexus_models import (
+    ChatParticipants,
+    Notification,
+    Thread,
+    db,
+)
+
+
+class NotificationCursor(Model):
+    """Last notification message a participant has read in a thread"""
+
+    participant = ForeignKeyField(
+        ChatParticipants, field=ChatParticipants.user_id, backref="notification_cursors"
+    )
+    thread = ForeignKeyField(Thread, field=Thread.thread_id, backref="notification_cursors")
+    last_read_message = IntegerField(default=0)
+    updated = DateTimeField(default=datetime.now)
+
+    class Meta:
+        database = db
+        indexes = ((("participant", "thread"), True),)
+
+
+class NotificationManager:
+    """Read state, bulk acknowledgement and retention for notifications.
+
+    Reading is tracked with one cursor row per (participant, thread) rather
+    than a flag per notification, so marking a thread read is a single upsert
+    no matter how many notifications it covers. Notifications at or below a
+    cursor are acknowledged and can be compacted away.
+    """
+
+    def __init__(self):
+        db.create_tables([NotificationCursor], safe=True)
+        self._compaction_stop = None
+
+    def mark_read(self, participant_id, thread_id=None, up_to_message_id=None):
+        """Mark notifications read, in one thread or all, up to a message id or all"""
+        source = Notification.select(
+            Notification.participant,
+            Notification.thread,
+            fn.MAX(Notification.message),
+            Value(datetime.now()),
+        ).where(self._scope(participant_id, thread_id, up_to_message_id))
+        source = source.group_by(Notification.participant, Notification.thread)
+
+        with db.atomic():
+            return (
+                NotificationCursor.insert_from(
+                    source,
+                    [
+                        NotificationCursor.participant,
+                        NotificationCursor.thread,
+                        NotificationCursor.last_read_message,
+                        NotificationCursor.updated,
+                    ],
+                )
+                .on_conflict(
+                    conflict_target=[NotificationCursor.participant, NotificationCursor.thread],
+                    update={
+                        # Cursors only move forward; CASE rather than the
+                        # SQLite-only two-argument MAX so Postgres works too
+                        NotificationCursor.last_read_message: Case(
+                            None,
+                            [(
+                                EXCLUDED.last_read_message > NotificationCursor.last_read_message,
+                                EXCLUDED.last_read_message,
+                            )],
+                            NotificationCursor.last_read_message,
+                        ),
+                        NotificationCursor.updated: EXCLUDED.updated,
+                    },
+                )
+                .execute()
+            )
+
+    def delete(self, participant_id, thread_id=None, up_to_message_id=None):
+        """Delete notifications, in one thread or all, up to a message id or all"""
+        with db.atomic():
+            return (
+                Notification.delete()
+                .where(self._scope(participant_id, thread_id, up_to_message_id))
+                .execute()
+            )
+
+    def get_unread_count(self, participant_id, thread_id=None):
+        """Count unread notifications for a participant, optionally in one thread"""
+        query = self.unread_query(participant_id)
+        if thread_id is not None:
+            query = query.where(Notification.thread == thread_id)
+        return query.scalar()
+
+    def unread_query(self, participant_id, thread_field=None):
+        """Count a participant's unread notifications.
+
+        ``thread_field`` correlates the query with an outer thread column so it
+        can be used as a per-thread subquery.
+        """
+        query = self._only_unread(Notification.select(fn.COUNT(Notification.id)), participant_id)
+        if thread_field is not None:
+            query = query.where(Notification.thread == thread_field)
+        return query
+
+    def get_notifications(self, participant_id, unread_only=False):
+        """Select a participant's notifications, optionally only unread ones"""
+        if not unread_only:
+            return Notification.select().where(Notification.participant == participant_id)
+        return self._only_unread(Notification.select(), participant_id)
+
+    def compact(self):
+        """Delete every acknowledged notification, returning how many were removed"""
+        acknowledged = NotificationCursor.select().where(
+            (NotificationCursor.participant == Notification.participant)
+            & (NotificationCursor.thread == Notification.thread)
+            & (Notification.message <= NotificationCursor.last_read_message)
+        )
+        with db.atomic():
+            return Notification.delete().where(fn.EXISTS(acknowledged)).execute()
+
+    def start_compaction(self, interval_seconds=3600):
+        """Run compact() every interval on a background thread"""
+        if self._compaction_stop is not None:
+            return
+        stop = threading.Event()
+        self._compaction_stop = stop
+
+        def compact_periodically():
+            while not stop.wait(interval_seconds):
+                try:
+                    removed = self.compact()
+                    if removed:
+                        print(f"Compacted {removed} acknowledged notifications.")
+                except Exception as e:
+                    print(f"Error compacting notifications: {str(e)}")
+
+        threading.Thread(target=compact_periodically, daemon=True).start()
+
+    def stop_compaction(self):
+        """Stop the background job started by start_compaction"""
+        if self._compaction_stop is not None:
+            self._compaction_stop.set()
+            self._compaction_stop = None
+
+    def _only_unread(self, query, participant_id):
+        cursor = NotificationCursor.alias()
+        return query.join(
+            cursor,
+            JOIN.LEFT_OUTER,
+            on=(
+                (cursor.participant == Notification.participant)
+                & (cursor.thread == Notification.thread)
+            ),
+        ).where(
+            (Notification.participant == participant_id)
+            & (
+                cursor.last_read_message.is_null()
+                | (Notification.message > cursor.last_read_message)
+            )
+        )
+
+    def _scope(self, participant_id, thread_id, up_to_message_id):
+        condition = Notification.participant == participant_id
+        if thread_id is not None:
+            condition &= Notification.thread == thread_id
+        if up_to_message_id is not None:
+            condition &= Notification.message <= up_to_message_id
+        return condition
@@ -0,0 +1,321 @@
+"""Offline benchmark for OrchestrationManager using a stub LLM engine.
+
+Measures what the orchestration layer itself costs, with LLM latency
+replaced by a configurable per-chunk delay. Example:
+
+    python -m nexus.nexus_base.orchestration_benchmark --requests 200 \\
+        --concurrency 8 --chunk-latency 0.001 --output bench.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+from nexus.nexus_base.a2a_history import A2AHistory
+from nexus.nexus_base.orchestration_manager import OrchestrationManager
+
+BENCHMARK_ORCHESTRATION = "Benchmark_Pipeline"
+
+
+class StubAgent:
+    """Agent engine that streams scripted responses with simulated latency"""
+
+    supports_actions = False
+    supports_knowledge = False
+    supports_memory = False
+
+    def __init__(self, engine: "StubEngine"):
+        self.engine = engine
+        self.name = "StubAgent"
+        self.profile = None
+        self.messages = []
+        self.last_message = ""
+
+    def get_response_stream(self, user_input: str, thread_id: Optional[str] = None):
+        response = self.engine.script(self.profile.name, user_input)
+
+        def generate_responses():
+            chunk_size = self.engine.chunk_size
+            for index in range(0, len(response), chunk_size):
+                if self.engine.chunk_latency:
+                    time.sleep(self.engine.chunk_latency)
+                    self.engine.add_simulated_latency(self.engine.chunk_latency)
+                yield response[index:index + chunk_size]
+            self.last_message = response
+
+        return generate_responses
+
+
+class StubEngine:
+    """Shared settings and scripted outputs for StubAgent instances"""
+
+    def __init__(
+            self,
+            script: Callable[[str, str], str],
+            chunk_latency: float = 0.0,
+            chunk_size: int = 16
+    ):
+        self.script = script
+        self.chunk_latency = chunk_latency
+        self.chunk_size = max(1, chunk_size)
+        self.simulated_latency = 0.0
+        self._lock = threading.Lock()
+
+    def add_simulated_latency(self, seconds: float):
+        with self._lock:
+            self.simulated_latency += seconds
+
+
+class StubNexus:
+    """The parts of Nexus that OrchestrationManager uses, backed by StubEngine"""
+
+    def __init__(self, engine: StubEngine):
+        self.engine = engine
+        self.agents_created = 0
+
+    def get_agent(self, agent_name: str) -> StubAgent:
+        self.agents_created += 1
+        return StubAgent(self.engine)
+
+    def get_profile(self, profile_name: str):
+        return SimpleNamespace(
+            name=profile_name, avatar="🤖", actions=None, knowledge=None, memory=None
+        )
+
+    def get_actions(self, action_names=None):
+        return []
+
+
+def chain_profiles(max_depth: int) -> List[str]:
+    """Profiles for a delegation chain that uses every allowed hop"""
+    return [f"Stage_{index}" for index in range(max(1, max_depth))]
+
+
+def build_benchmark_config(max_depth: int, timeout_seconds: Optional[float]) -> Dict:
+    """Orchestration YAML data for a chain Stage_0 -> Stage_1 -> ..."""
+    profiles = chain_profiles(max_depth)
+    agent_network = []
+    for index, profile in enumerate(profiles):
+        agent_network.append({
+            "profile": profile,
+            "engine": "StubAgent",
+            "role": "stage",
+            "capabilities": ["benchmark"],
+            "can_delegate_to": profiles[index + 1:index + 2],
+        })
+    communication = {"include_context": True, "max_delegation_depth": max_depth}
+    if timeout_seconds:
+        communication["timeout_seconds"] = timeout_seconds
+    return {
+        "orchestrationConfig": {
+            "name": BENCHMARK_ORCHESTRATION,
+            "orchestrator_profile": profiles[0],
+            "orchestrator_engine": "StubAgent",
+            "description": "Offline benchmark chain",
+            "agent_network": agent_network,
+            "orchestration_rules": [],
+            "communication": communication,
+        }
+    }
+
+
+def build_script(max_depth: int, response_size: int, delegate: bool) -> Callable[[str, str], str]:
+    """Scripted outputs: each stage delegates to the next, the last one answers"""
+    profiles = chain_profiles(max_depth)
+    answer = ("lorem ipsum " * (response_size // 12 + 1))[:response_size]
+
+    def script(profile_name: str, prompt: str) -> str:
+        if not delegate or prompt.startswith("Based on the following information"):
+            return answer
+        index = profiles.index(profile_name)
+        if index + 1 < len(profiles):
+            return f"[DELEGATE: {profiles[index + 1]}]\nContinue processing: {prompt[:80]}"
+        return answer
+
+    return script
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an unsorted list"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict:
+    return {
+        "requests": len(latencies),
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "mean": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+            "p50": percentile(latencies, 0.50) * 1000,
+            "p95": percentile(latencies, 0.95) * 1000,
+            "p99": percentile(latencies, 0.99) * 1000,
+        },
+    }
+
+
+def run_scenario(
+        name: str,
+        requests: int,
+        concurrency: int,
+        chunk_latency: float,
+        chunk_size: int,
+        response_size: int,
+        max_depth: int,
+        delegate: bool,
+        stream: bool,
+        timeout_seconds: Optional[float] = None,
+        use_async: bool = False
+) -> Dict:
+    """Drive one scenario and return its metrics"""
+    engine = StubEngine(build_script(max_depth, response_size, delegate), chunk_latency, chunk_size)
+    stub_nexus = StubNexus(engine)
+    # An empty scratch directory keeps the checkout's orchestrations out of the run
+    directory = tempfile.mkdtemp(prefix="orchestration-benchmark-")
+    manager = OrchestrationManager(stub_nexus, directory=directory)
+    # Keep benchmark traffic out of the application database
+    manager.conversation_history = A2AHistory(persist=False)
+    manager.create_orchestration_config(build_benchmark_config(max_depth, timeout_seconds))
+    manager.set_active_orchestration(BENCHMARK_ORCHESTRATION)
+
+    latencies = []
+    first_token = []
+    lock = threading.Lock()
+
+    def one_request(index: int):
+        start = time.perf_counter()
+        if stream:
+            first = None
+            for _ in manager.orchestrate_request_stream(f"benchmark request {index}"):
+                if first is None:
+                    first = time.perf_counter() - start
+        else:
+            manager.orchestrate_request(f"benchmark request {index}")
+            first = None
+        latency = time.perf_counter() - start
+        with lock:
+            latencies.append(latency)
+            if first is not None:
+                first_token.append(first)
+
+    async def one_request_async(index: int, slots: asyncio.Semaphore):
+        async with slots:
+            start = time.perf_counter()
+            first = None
+            async for _ in manager.orchestrate_request_stream_async(f"benchmark request {index}"):
+                if first is None:
+                    first = time.perf_counter() - start
+            latencies.append(time.perf_counter() - start)
+            first_token.append(first)
+
+    async def drive():
+        # Every request shares one event loop, at most `concurrency` in flight
+        slots = asyncio.Semaphore(concurrency)
+        await asyncio.gather(*(one_request_async(index, slots) for index in range(requests)))
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    if use_async:
+        asyncio.run(drive())
+    elif concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(one_request, range(requests)))
+    else:
+        for index in range(requests):
+            one_request(index)
+    elapsed = time.perf_counter() - started
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {"scenario": name, "concurrency": concurrency}
+    result.update(summarize(latencies, elapsed))
+    if first_token:
+        result["time_to_first_token_ms"] = {
+            "p50": percentile(first_token, 0.50) * 1000,
+            "p95": percentile(first_token, 0.95) * 1000,
+            "p99": percentile(first_token, 0.99) * 1000,
+        }
+    result["simulated_llm_ms_per_request"] = engine.simulated_latency / requests * 1000 if requests else 0.0
+    result["overhead_ms_per_request"] = (
+        result["latency_ms"]["mean"] - result["simulated_llm_ms_per_request"]
+    )
+    result["peak_memory_bytes"] = peak_memory
+    result["agents_created"] = stub_nexus.agents_created
+    result["agent_pool"] = manager.get_agent_pool_stats()
+    manager.shutdown_engine()
+    shutil.rmtree(directory, ignore_errors=True)
+    return result
+
+
+def run_benchmarks(args) -> Dict:
+    common = dict(
+        requests=args.requests,
+        concurrency=args.concurrency,
+        chunk_latency=args.chunk_latency,
+        chunk_size=args.chunk_size,
+        response_size=args.response_size,
+        max_depth=args.max_depth,
+        timeout_seconds=args.timeout,
+    )
+    scenarios = {
+        "direct": dict(delegate=False, stream=False),
+        "direct_stream": dict(delegate=False, stream=True),
+        "delegation_chain": dict(delegate=True, stream=False),
+        "delegation_chain_stream": dict(delegate=True, stream=True),
+        "delegation_chain_async": dict(delegate=True, stream=True, use_async=True),
+    }
+    selected = args.scenario or list(scenarios)
+    return {
+        "settings": vars(args),
+        "results": [run_scenario(name, **common, **scenarios[name]) for name in selected],
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline OrchestrationManager benchmark")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--chunk-latency", type=float, default=0.0,
+                        help="Seconds the stub engine waits before each chunk")
+    parser.add_argument("--chunk-size", type=int, default=16, help="Characters per streamed chunk")
+    parser.add_argument("--response-size", type=int, default=512, help="Characters per final answer")
+    parser.add_argument("--max-depth", type=int, default=3,
+                        help="max_delegation_depth; the chain uses every allowed hop")
+    parser.add_argument("--timeout", type=float, default=None, help="communication.timeout_seconds")
+    parser.add_argument("--scenario", action="append",
+                        choices=["direct", "direct_stream", "delegation_chain", "delegation_chain_stream",
+                                 "delegation_chain_async"])
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # The managers log with print(); keep stdout for the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        report = run_benchmarks(args)
+    text = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text)
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
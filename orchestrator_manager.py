@@ -1,8 +1,31 @@
+import asyncio
+import contextvars
 import os
+import queue
+import threading
+import time
 import yaml
-from typing import Dict, List, Optional, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Any, Tuple
 import re
 
+from nexus.nexus_base.a2a_history import A2AHistory
+from nexus.nexus_base.agent_pool import AgentPool, copy_agent
+from nexus.nexus_base.pipeline_executor import PipelineExecutor, PipelineStage
+from nexus.nexus_base.response_cache import ResponseCache
+
+DELEGATE_PREFIX = "[DELEGATE:"
+DELEGATE_LINE_PATTERN = re.compile(r'^\s*\[DELEGATE:\s*([\w_]+)\]\s*(.*)$')
+TIMEOUT_MARKER = "[TIMEOUT]"
+_STREAM_END = object()
+
+# (manager, config) pinned for the request running in this context
+_pinned_orchestration = contextvars.ContextVar("pinned_orchestration", default=None)
+
+
+class OrchestrationTimeout(Exception):
+    """Raised when a hop runs past the orchestration request deadline"""
+
 
 class OrchestrationConfig:
     """Represents an orchestration configuration"""
@@ -29,13 +52,74 @@ class OrchestrationConfig:
         self.profile_capabilities = {}
         self.profile_delegation_map = {}
         self.profile_to_engine = {}
+        self.profile_roles = {}
+        self.agents_by_profile = {}
+        self.rules_by_condition = {}
 
         for agent_config in agent_network:
             profile_name = agent_config.get('profile')
             if profile_name:
+                self.agents_by_profile[profile_name] = agent_config
                 self.profile_capabilities[profile_name] = agent_config.get('capabilities', [])
                 self.profile_delegation_map[profile_name] = agent_config.get('can_delegate_to', [])
                 self.profile_to_engine[profile_name] = agent_config.get('engine', 'AzureOpenAIAgent')
+                self.profile_roles[profile_name] = agent_config.get('role', 'specialist')
+
+        for rule in orchestration_rules:
+            self.rules_by_condition.setdefault(rule.get('condition'), []).append(rule)
+
+        # Prompt text around the user input, rendered once per profile
+        self.prompt_scaffolds = {
+            profile_name: self._render_prompt_scaffold(profile_name)
+            for profile_name in {orchestrator_profile, *self.agents_by_profile}
+        }
+
+    def build_prompt(self, profile_name: str, user_input: str) -> str:
+        """Build the orchestration prompt for a profile around the user input"""
+        scaffold = self.prompt_scaffolds.get(profile_name)
+        if scaffold is None:
+            scaffold = self.prompt_scaffolds[profile_name] = self._render_prompt_scaffold(profile_name)
+        prefix, suffix = scaffold
+        return f"{prefix}{user_input}{suffix}"
+
+    def get_rule(self, condition: str, action: Optional[str] = None) -> Optional[Dict]:
+        """Get the first rule for a condition, optionally requiring an action"""
+        for rule in self.rules_by_condition.get(condition, []):
+            if action is None or rule.get('action') == action:
+                return rule
+        return None
+
+    def _render_prompt_scaffold(self, profile_name: str) -> Tuple[str, str]:
+        available_profiles = []
+        for delegate in self.profile_delegation_map.get(profile_name, []):
+            capabilities_str = ", ".join(self.profile_capabilities.get(delegate, []))
+            available_profiles.append(
+                f"- {delegate}: {self.profile_roles.get(delegate, 'specialist')} (capabilities: {capabilities_str})"
+            )
+
+        if available_profiles:
+            prefix = f"""You are the orchestrator with profile: {profile_name}. 
+You can coordinate with other specialist agents when needed.
+
+Available specialists you can delegate to:
+{chr(10).join(available_profiles)}
+
+If you need specialist help, indicate this by starting your response with [DELEGATE: ProfileName] 
+followed by the specific question or task for that specialist.
+To consult several specialists at once, start each task on its own line with [DELEGATE: ProfileName].
+
+User request: """
+            suffix = """
+
+Process this request. If you can handle it completely, respond directly. 
+If a specialist would provide better results, delegate to them."""
+        else:
+            prefix = f"""You are processing this request with profile: {profile_name}.
+
+User request: """
+            suffix = ""
+
+        return prefix, suffix
 
 
 class AgentMessage:
@@ -71,17 +155,65 @@ class AgentMessage:
 class OrchestrationManager:
     """Manages agent-to-agent orchestration based on profiles"""
 
-    def __init__(self, nexus_instance):
+    def __init__(
+            self,
+            nexus_instance,
+            history_size: int = 200,
+            bridge_workers: int = 32,
+            directory: Optional[str] = None
+    ):
         self.nexus = nexus_instance
-        self.directory = os.path.join(
+        self.directory = directory or os.path.join(
             os.path.dirname(__file__),
             "nexus_orchestrations"
         )
         self.orchestration_configs = []
-        self.active_orchestration = None
-        self.conversation_history = []
+        self.orchestrations_by_name = {}
+        self._active_orchestration = None
+        self._file_configs = {}
+        self._file_stamps = {}
+        self._added_configs = []
+        self._configs_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._reload_stop = None
+        self.conversation_history = A2AHistory(history_size)
+        self.agent_pool = AgentPool(self._build_agent_with_profile)
+        self.response_caches = {}
+        self._response_cache_settings = {}
+        self._response_caches_lock = threading.Lock()
+        # The synchronous API runs requests on this loop; blocking agent
+        # streams are read on the bridge executor, one thread per live stream
+        self._engine_loop = None
+        self._engine_thread = None
+        self._engine_lock = threading.Lock()
+        self._bridge_executor = ThreadPoolExecutor(
+            max_workers=bridge_workers, thread_name_prefix="orchestration-stream"
+        )
         self.load_orchestrations()
 
+    @property
+    def active_orchestration(self) -> Optional[OrchestrationConfig]:
+        """The active config, or the snapshot a running request started with"""
+        pinned = _pinned_orchestration.get()
+        if pinned is not None and pinned[0] is self:
+            return pinned[1]
+        return self._active_orchestration
+
+    @active_orchestration.setter
+    def active_orchestration(self, config: Optional[OrchestrationConfig]):
+        self._active_orchestration = config
+
+    def _pin_orchestration(self, config: Optional[OrchestrationConfig]):
+        """Pin a config for the current request so reloads do not affect it"""
+        return _pinned_orchestration.set((self, config))
+
+    def _unpin_orchestration(self, token):
+        try:
+            _pinned_orchestration.reset(token)
+        except ValueError:
+            # Generator finalized from another context, nothing left to restore
+            pass
+
     def load_orchestrations(self):
         """Load all orchestration configurations from YAML files"""
         if not os.path.exists(self.directory):
@@ -89,26 +221,124 @@ class OrchestrationManager:
             print(f"Created orchestrations directory: {self.directory}")
             return
 
-        loaded_count = 0
-        for filename in os.listdir(self.directory):
-            if filename.endswith(".yaml") or filename.endswith(".yml"):
+        self.reload_orchestrations()
+        print(f"Loaded {len(self._file_configs)} orchestration configurations.")
+
+    def reload_orchestrations(self) -> Dict[str, List[str]]:
+        """Re-parse new or changed orchestration YAMLs and swap them in.
+
+        Files are compared by modification time and size, so unchanged files
+        are not read again. The new set of configs replaces the old one in a
+        single swap; requests already running keep the config they pinned at
+        start. A file that fails to parse keeps its previous config. Returns
+        the names of added, updated and removed orchestrations.
+        """
+        summary = {"added": [], "updated": [], "removed": []}
+        if not os.path.exists(self.directory):
+            return summary
+
+        with self._reload_lock:
+            file_configs = dict(self._file_configs)
+            file_stamps = dict(self._file_stamps)
+            seen = set()
+
+            for filename in sorted(os.listdir(self.directory)):
+                if not (filename.endswith(".yaml") or filename.endswith(".yml")):
+                    continue
                 file_path = os.path.join(self.directory, filename)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                seen.add(filename)
+                stamp = (stat.st_mtime_ns, stat.st_size)
+                if file_stamps.get(filename) == stamp:
+                    continue
+                file_stamps[filename] = stamp
+
                 try:
                     with open(file_path, "r", encoding="utf-8") as file:
                         config_data = yaml.safe_load(file)
-                        self.create_orchestration_config(config_data)
-                        loaded_count += 1
                 except Exception as e:
                     print(f"Error loading orchestration from {filename}: {str(e)}")
+                    continue
+
+                orchestration = self._parse_orchestration_config(config_data)
+                if orchestration is None:
+                    continue
+                key = "updated" if filename in file_configs else "added"
+                summary[key].append(orchestration.name)
+                file_configs[filename] = orchestration
+
+            for filename in list(file_configs):
+                if filename not in seen:
+                    summary["removed"].append(file_configs.pop(filename).name)
+            for filename in list(file_stamps):
+                if filename not in seen:
+                    del file_stamps[filename]
+
+            self._file_stamps = file_stamps
+            if any(summary.values()):
+                with self._configs_lock:
+                    self._file_configs = file_configs
+                    self._rebuild_index_locked()
+                    # Configs added with create_orchestration_config count too
+                    configs = list(self.orchestrations_by_name.values())
+                self._drop_stale_response_caches(configs)
+
+        return summary
+
+    def start_reload_polling(self, interval_seconds: float = 5.0):
+        """Reload changed orchestration YAMLs every interval on a background thread"""
+        if self._reload_stop is not None:
+            return
+        stop = threading.Event()
+        self._reload_stop = stop
 
-        print(f"Loaded {loaded_count} orchestration configurations.")
+        def poll():
+            while not stop.wait(interval_seconds):
+                try:
+                    summary = self.reload_orchestrations()
+                    if any(summary.values()):
+                        print(f"Reloaded orchestrations: {summary}")
+                except Exception as e:
+                    print(f"Error reloading orchestrations: {str(e)}")
+
+        threading.Thread(target=poll, daemon=True).start()
+
+    def stop_reload_polling(self):
+        """Stop the background reload started by start_reload_polling"""
+        if self._reload_stop is not None:
+            self._reload_stop.set()
+            self._reload_stop = None
+
+    def _rebuild_index_locked(self):
+        configs = [self._file_configs[filename] for filename in sorted(self._file_configs)]
+        configs.extend(self._added_configs)
+        by_name = {}
+        for config in configs:
+            by_name.setdefault(config.name, config)
+        self.orchestration_configs, self.orchestrations_by_name = configs, by_name
+
+        if self._active_orchestration is not None:
+            self._active_orchestration = by_name.get(
+                self._active_orchestration.name, self._active_orchestration
+            )
 
     def create_orchestration_config(self, config_data: Dict):
         """Create an orchestration config from YAML data"""
+        orchestration = self._parse_orchestration_config(config_data)
+        if orchestration is not None:
+            with self._configs_lock:
+                self._added_configs.append(orchestration)
+                self._rebuild_index_locked()
+
+    def _parse_orchestration_config(self, config_data: Dict) -> Optional[OrchestrationConfig]:
+        """Build an OrchestrationConfig from parsed YAML, or None if invalid"""
         try:
             if "orchestrationConfig" in config_data:
                 config = config_data["orchestrationConfig"]
-                orchestration = OrchestrationConfig(
+                return OrchestrationConfig(
                     name=config.get("name", "Unnamed"),
                     orchestrator_profile=config.get("orchestrator_profile", ""),
                     orchestrator_engine=config.get("orchestrator_engine", "AzureOpenAIAgent"),
@@ -117,11 +347,11 @@ class OrchestrationManager:
                     orchestration_rules=config.get("orchestration_rules", []),
                     communication=config.get("communication", {})
                 )
-                self.orchestration_configs.append(orchestration)
             else:
                 print("Warning: YAML file missing 'orchestrationConfig' key")
         except Exception as e:
             print(f"Error creating orchestration config: {str(e)}")
+        return None
 
     def get_orchestration_names(self) -> List[str]:
         """Get all orchestration configuration names"""
@@ -129,24 +359,24 @@ class OrchestrationManager:
 
     def get_orchestration(self, name: str) -> Optional[OrchestrationConfig]:
         """Get orchestration by name"""
-        for config in self.orchestration_configs:
-            if config.name == name:
-                return config
-        return None
+        return self.orchestrations_by_name.get(name)
 
     def set_active_orchestration(self, name: str) -> bool:
         """Set the active orchestration configuration"""
         config = self.get_orchestration(name)
         if config:
             self.active_orchestration = config
-            self.conversation_history = []
             print(f"Active orchestration set to: {name}")
             return True
         print(f"Orchestration '{name}' not found")
         return False
 
     def initialize_agent_with_profile(self, profile_name: str, engine_name: str = None):
-        """Initialize an agent with a specific profile"""
+        """Initialize an agent with a specific profile
+
+        Agents come from the warm pool; hand them back with release_agent()
+        once the hop is done so the next request can reuse them.
+        """
         try:
             if engine_name is None:
                 engine_name = self.active_orchestration.profile_to_engine.get(
@@ -154,33 +384,45 @@ class OrchestrationManager:
                     'AzureOpenAIAgent'
                 )
 
-            agent = self.nexus.get_agent(engine_name)
-            profile = self.nexus.get_profile(profile_name)
-            agent.profile = profile
+            return self.agent_pool.checkout(engine_name, profile_name)
+
+        except Exception as e:
+            print(f"Error initializing agent with profile {profile_name}: {str(e)}")
+            raise
 
-            if hasattr(profile, 'actions') and profile.actions and agent.supports_actions:
-                agent.actions = self.nexus.get_actions(profile.actions)
-            elif agent.supports_actions:
-                agent.actions = []
+    def release_agent(self, agent):
+        """Return an agent from initialize_agent_with_profile to the pool"""
+        if agent is not None:
+            self.agent_pool.checkin(agent)
 
-            if hasattr(profile, 'knowledge') and profile.knowledge and agent.supports_knowledge:
-                agent.knowledge_store = profile.knowledge[0] if isinstance(profile.knowledge, list) else profile.knowledge
-            elif agent.supports_knowledge:
-                agent.knowledge_store = "None"
+    def get_agent_pool_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters for the warm agent pool"""
+        return self.agent_pool.get_stats()
 
-            if hasattr(profile, 'memory') and profile.memory and agent.supports_memory:
-                agent.memory_store = profile.memory[0] if isinstance(profile.memory, list) else profile.memory
-            elif agent.supports_memory:
-                agent.memory_store = "None"
+    def _build_agent_with_profile(self, engine_name: str, profile_name: str):
+        """Build a new agent for the pool with the profile's actions and stores"""
+        # get_agent returns the engine's shared agent, which the chat UI and other
+        # pool entries also use, so every pooled entry gets its own instance
+        agent = copy_agent(self.nexus.get_agent(engine_name))
+        profile = self.nexus.get_profile(profile_name)
+        agent.profile = profile
 
-            if hasattr(agent, 'messages'):
-                agent.messages = []
+        if hasattr(profile, 'actions') and profile.actions and agent.supports_actions:
+            agent.actions = self.nexus.get_actions(profile.actions)
+        elif agent.supports_actions:
+            agent.actions = []
 
-            return agent
+        if hasattr(profile, 'knowledge') and profile.knowledge and agent.supports_knowledge:
+            agent.knowledge_store = profile.knowledge[0] if isinstance(profile.knowledge, list) else profile.knowledge
+        elif agent.supports_knowledge:
+            agent.knowledge_store = "None"
 
-        except Exception as e:
-            print(f"Error initializing agent with profile {profile_name}: {str(e)}")
-            raise
+        if hasattr(profile, 'memory') and profile.memory and agent.supports_memory:
+            agent.memory_store = profile.memory[0] if isinstance(profile.memory, list) else profile.memory
+        elif agent.supports_memory:
+            agent.memory_store = "None"
+
+        return agent
 
     def get_best_profile_for_task(self, task: str, required_capabilities: List[str] = None) -> Optional[str]:
         """Determine which profile is best suited for a task"""
@@ -210,55 +452,218 @@ class OrchestrationManager:
         allowed_delegates = self.active_orchestration.profile_delegation_map.get(from_profile, [])
         return to_profile in allowed_delegates
 
-    def delegate_to_profile(self, message: AgentMessage) -> str:
-        """Delegate a task to a specific profile - SYNCHRONOUS VERSION"""
-        try:
-            max_depth = self.active_orchestration.communication.get('max_delegation_depth', 3)
-            if message.depth >= max_depth:
-                return "Maximum delegation depth reached. Unable to process request."
-
-            if not self.can_delegate(message.from_profile, message.to_profile):
-                return f"Delegation from {message.from_profile} to {message.to_profile} not allowed by configuration."
+    def delegate_to_profile(self, message: AgentMessage, deadline: Optional[float] = None) -> str:
+        """Delegate a task to a specific profile - SYNCHRONOUS VERSION
 
-            agent = self.initialize_agent_with_profile(message.to_profile)
+        Runs delegate_to_profile_async on the engine loop and waits for it.
+        """
+        return self._run_sync(self.delegate_to_profile_async(message, deadline))
 
-            context_prompt = ""
-            if self.active_orchestration.communication.get('include_context', True):
-                context_prompt = f"\n\nContext: You are receiving this request from {message.from_profile}. "
-                if message.context:
-                    context_prompt += f"Previous context: {message.context.get('summary', '')}"
+    async def delegate_to_profile_async(self, message: AgentMessage, deadline: Optional[float] = None) -> str:
+        """Delegate a task to a specific profile
 
-            full_prompt = f"{message.content}{context_prompt}"
+        ``deadline`` is a ``time.monotonic()`` timestamp; the hop only gets the
+        budget left before it, and on overrun the partial response is returned
+        followed by TIMEOUT_MARKER.
+        """
+        agent = None
+        full_response = ""
+        try:
+            refusal = self._check_delegation(message, deadline)
+            if refusal is not None:
+                return refusal
+
+            full_prompt = self._delegation_prompt(message)
+
+            config = self.active_orchestration
+            engine_name = config.profile_to_engine.get(message.to_profile, 'AzureOpenAIAgent')
+            cache = self._get_response_cache(config)
+            cache_key = None
+            cached = None
+            if cache is not None:
+                cache_key = ResponseCache.make_key(config.name, message.to_profile, engine_name, full_prompt)
+                cached = cache.get(cache_key)
+            if cached is not None:
+                full_response = cached
+                self._record_exchange(message, full_response)
+                return full_response
+
+            agent = self.initialize_agent_with_profile(message.to_profile, engine_name)
 
-            # Get response using synchronous streaming
-            response_generator = agent.get_response_stream(full_prompt)
-            
             # Collect the full response
-            full_response = ""
-            for chunk in response_generator():
-                full_response += chunk
+            try:
+                async for chunk in self._consume_stream_async(agent, full_prompt, deadline):
+                    full_response += chunk
+            except OrchestrationTimeout:
+                full_response += self._timeout_notice(message.to_profile)
+                # Its stream may still be running, so it cannot go back to the pool
+                self.agent_pool.discard(agent)
+                agent = None
+            else:
+                if cache is not None:
+                    cache.set(cache_key, full_response)
 
-            self.conversation_history.append({
-                "from": message.from_profile,
-                "to": message.to_profile,
-                "request": message.content,
-                "response": full_response,
-                "depth": message.depth
-            })
+            self._record_exchange(message, full_response)
 
             return full_response
 
+        except asyncio.CancelledError:
+            self.agent_pool.discard(agent)
+            agent = None
+            raise
+
         except Exception as e:
             error_msg = f"Error during delegation: {str(e)}"
             print(error_msg)
             return error_msg
 
+        finally:
+            self.release_agent(agent)
+
+    def _check_delegation(self, message: AgentMessage, deadline: Optional[float]) -> Optional[str]:
+        """Get the response for a delegation that must not run, or None if it may"""
+        if deadline is not None and time.monotonic() >= deadline:
+            return self._timeout_notice(message.to_profile)
+
+        max_depth = self.active_orchestration.communication.get('max_delegation_depth', 3)
+        if message.depth >= max_depth:
+            return "Maximum delegation depth reached. Unable to process request."
+
+        if not self.can_delegate(message.from_profile, message.to_profile):
+            return f"Delegation from {message.from_profile} to {message.to_profile} not allowed by configuration."
+
+        return None
+
+    def _delegation_prompt(self, message: AgentMessage) -> str:
+        """Build the prompt a delegate receives, with context if configured"""
+        context_prompt = ""
+        if self.active_orchestration.communication.get('include_context', True):
+            context_prompt = f"\n\nContext: You are receiving this request from {message.from_profile}. "
+            if message.context:
+                context_prompt += f"Previous context: {message.context.get('summary', '')}"
+
+        return f"{message.content}{context_prompt}"
+
+    def _record_exchange(self, message: AgentMessage, response: str):
+        """Add a delegation exchange to the A2A history"""
+        self.conversation_history.append({
+            "orchestration": self.active_orchestration.name,
+            "thread_id": message.context.get("thread_id"),
+            "from": message.from_profile,
+            "to": message.to_profile,
+            "request": message.content,
+            "response": response,
+            "depth": message.depth
+        })
+
+    def _get_response_cache(self, config: OrchestrationConfig) -> Optional[ResponseCache]:
+        """Get the delegate response cache for an orchestration, if it enables one
+
+        Configured under communication.response_cache with ``enabled``,
+        ``ttl_seconds``, ``max_entries``, ``max_bytes`` and an optional SQLite
+        ``path`` (relative paths resolve against the orchestrations directory).
+        """
+        settings = config.communication.get('response_cache') or {}
+        if not settings.get('enabled', False):
+            return None
+
+        cache = self.response_caches.get(config.name)
+        if cache is not None:
+            return cache
+
+        with self._response_caches_lock:
+            cache = self.response_caches.get(config.name)
+            if cache is None:
+                path = settings.get('path')
+                if path and not os.path.isabs(path):
+                    path = os.path.join(self.directory, path)
+                cache = ResponseCache(
+                    ttl_seconds=settings.get('ttl_seconds', 3600),
+                    max_entries=settings.get('max_entries', 256),
+                    max_bytes=settings.get('max_bytes'),
+                    path=path
+                )
+                self.response_caches[config.name] = cache
+                self._response_cache_settings[config.name] = dict(settings)
+        return cache
+
+    def _drop_stale_response_caches(self, configs):
+        """Drop caches whose orchestration is gone or has new cache settings
+
+        The next request rebuilds them from the reloaded settings.
+        """
+        settings_by_name = {
+            config.name: config.communication.get('response_cache') or {}
+            for config in configs
+        }
+        with self._response_caches_lock:
+            for name in list(self.response_caches):
+                if self._response_cache_settings.get(name) != settings_by_name.get(name):
+                    del self.response_caches[name]
+                    self._response_cache_settings.pop(name, None)
+
+    def get_response_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get hit/miss counters for each orchestration's response cache"""
+        return {name: cache.get_stats() for name, cache in self.response_caches.items()}
+
     def orchestrate_request(self, user_input: str, thread_id: Optional[str] = None) -> str:
-        """Main orchestration method - SYNCHRONOUS VERSION"""
+        """Main orchestration method - SYNCHRONOUS VERSION
+
+        Runs orchestrate_request_async on the engine loop and waits for it.
+        """
+
+        if not self.active_orchestration:
+            raise ValueError("No active orchestration configuration set")
+
+        return self._run_sync(self.orchestrate_request_async(user_input, thread_id))
+
+    async def orchestrate_request_async(self, user_input: str, thread_id: Optional[str] = None) -> str:
+        """Main orchestration method"""
 
         if not self.active_orchestration:
             raise ValueError("No active orchestration configuration set")
 
+        chunks = []
+        async for chunk in self._orchestrate_chunks(user_input, thread_id):
+            chunks.append(chunk)
+        return "".join(chunks)
+
+    async def orchestrate_request_stream_async(
+            self,
+            user_input: str,
+            thread_id: Optional[str] = None,
+            progress_callback: Optional[Callable[[Dict], None]] = None
+    ):
+        """Stream version - an async generator of response chunks
+
+        Same chunks and progress events as orchestrate_request_stream, with
+        ``progress_callback`` invoked on the event loop.
+        """
+
+        if not self.active_orchestration:
+            yield "Error: No active orchestration configuration set"
+            return
+
+        async for chunk in self._orchestrate_chunks(user_input, thread_id, progress_callback):
+            yield chunk
+
+    async def _orchestrate_chunks(
+            self,
+            user_input: str,
+            thread_id: Optional[str] = None,
+            progress_callback: Optional[Callable[[Dict], None]] = None
+    ):
+        """Run the orchestration, yielding response chunks as they arrive.
+
+        The orchestrator's chunks are forwarded live unless its response opens
+        with a delegation directive, in which case the directive is collected,
+        the delegates run, and the synthesis pass is streamed instead.
+        """
+        pin = self._pin_orchestration(self.active_orchestration)
+        orchestrator = None
+        deadline = self._request_deadline()
+        full_response = ""
+        streaming = False
         try:
             orchestrator = self.initialize_agent_with_profile(
                 self.active_orchestration.orchestrator_profile,
@@ -267,85 +672,260 @@ class OrchestrationManager:
 
             orchestration_prompt = self._build_orchestration_prompt(user_input)
 
-            response_generator = orchestrator.get_response_stream(orchestration_prompt)
+            self._emit_progress(progress_callback, "orchestrating",
+                                self.active_orchestration.orchestrator_profile)
 
-            full_response = ""
-            for chunk in response_generator():
+            async for chunk in self._consume_stream_async(orchestrator, orchestration_prompt, deadline):
                 full_response += chunk
+                if streaming:
+                    yield chunk
+                elif self._is_direct_response(full_response):
+                    # Not a delegation directive, release what was held back
+                    streaming = True
+                    yield full_response
+
+            if streaming:
+                return
+
+            streaming = True
+            if not self._check_for_delegation(full_response):
+                yield full_response
+                return
+
+            delegated_response = await self._handle_delegation(
+                user_input,
+                full_response,
+                self.active_orchestration.orchestrator_profile,
+                progress_callback,
+                deadline=deadline,
+                thread_id=thread_id
+            )
 
-            delegation_needed = self._check_for_delegation(full_response)
-
-            if delegation_needed:
-                delegated_response = self._handle_delegation(
-                    user_input,
-                    full_response,
-                    self.active_orchestration.orchestrator_profile
-                )
+            if deadline is not None and time.monotonic() >= deadline:
+                # No budget left for synthesis, return what the delegates produced
+                yield delegated_response
+                if TIMEOUT_MARKER not in delegated_response:
+                    yield self._timeout_notice(self.active_orchestration.orchestrator_profile)
+                return
 
-                synthesis_prompt = f"""Based on the following information:
+            synthesis_prompt = f"""Based on the following information:
 Original request: {user_input}
 Your initial processing: {full_response}
-Result from {self._extract_delegate_profile(full_response)}: {delegated_response}
+Result from {', '.join(self._extract_delegate_profiles(full_response))}: {delegated_response}
 
 Provide a comprehensive final response to the user."""
 
-                final_generator = orchestrator.get_response_stream(synthesis_prompt)
-                synthesized = ""
-                for chunk in final_generator():
-                    synthesized += chunk
-
-                return synthesized
-
-            return full_response
+            self._emit_progress(progress_callback, "synthesizing",
+                                self.active_orchestration.orchestrator_profile)
+            async for chunk in self._consume_stream_async(orchestrator, synthesis_prompt, deadline):
+                yield chunk
+
+        except OrchestrationTimeout:
+            self.agent_pool.discard(orchestrator)
+            orchestrator = None
+            if not streaming:
+                # The held-back start of the response is the partial result
+                yield full_response
+            yield self._timeout_notice(self.active_orchestration.orchestrator_profile)
+
+        except (asyncio.CancelledError, GeneratorExit):
+            # Abandoned mid-stream, the orchestrator may still be producing
+            self.agent_pool.discard(orchestrator)
+            orchestrator = None
+            raise
 
         except Exception as e:
             error_msg = f"Error during orchestration: {str(e)}"
             print(error_msg)
-            return error_msg
-
-    def _build_orchestration_prompt(self, user_input: str) -> str:
-        """Build prompt with orchestration context"""
-
-        available_profiles = []
-        current_profile = self.active_orchestration.orchestrator_profile
-        can_delegate_to = self.active_orchestration.profile_delegation_map.get(current_profile, [])
-
-        for profile_name in can_delegate_to:
-            capabilities = self.active_orchestration.profile_capabilities.get(profile_name, [])
-            role = next(
-                (cfg['role'] for cfg in self.active_orchestration.agent_network
-                 if cfg.get('profile') == profile_name),
-                'specialist'
-            )
-            capabilities_str = ", ".join(capabilities)
-            available_profiles.append(
-                f"- {profile_name}: {role} (capabilities: {capabilities_str})"
-            )
-
-        if available_profiles:
-            orchestration_context = f"""You are the orchestrator with profile: {current_profile}. 
-You can coordinate with other specialist agents when needed.
-
-Available specialists you can delegate to:
-{chr(10).join(available_profiles)}
-
-If you need specialist help, indicate this by starting your response with [DELEGATE: ProfileName] 
-followed by the specific question or task for that specialist.
+            yield error_msg
+
+        finally:
+            self.release_agent(orchestrator)
+            self._unpin_orchestration(pin)
+
+    def _is_direct_response(self, partial_response: str) -> bool:
+        """Check if a partial response can no longer turn into a delegation"""
+        stripped = partial_response.lstrip()
+        if len(stripped) < len(DELEGATE_PREFIX):
+            return not DELEGATE_PREFIX.startswith(stripped)
+        return not stripped.startswith(DELEGATE_PREFIX)
+
+    def _request_deadline(self) -> Optional[float]:
+        """Deadline for a request from communication.timeout_seconds, if set"""
+        timeout = self.active_orchestration.communication.get('timeout_seconds')
+        if not timeout:
+            return None
+        return time.monotonic() + float(timeout)
+
+    def _timeout_notice(self, profile: str) -> str:
+        """Marker appended to a partial result when a hop runs out of time"""
+        return f"\n\n{TIMEOUT_MARKER} {profile} did not finish within the orchestration timeout."
+
+    def _consume_stream(self, response_generator, deadline: Optional[float]):
+        """Yield chunks from an agent stream until it ends or the deadline passes.
+
+        With a deadline the stream is read on a helper thread so that even a
+        stalled chunk cannot hold the caller past the budget; the helper is
+        told to stop and close the stream once the caller gives up.
+        OrchestrationTimeout is raised after the chunks received in time.
+        """
+        if deadline is None:
+            yield from response_generator()
+            return
 
-User request: {user_input}
+        chunks = queue.Queue()
+        cancelled = threading.Event()
+
+        def produce():
+            stream = response_generator()
+            try:
+                for chunk in stream:
+                    if cancelled.is_set():
+                        break
+                    chunks.put((chunk, None))
+                chunks.put((_STREAM_END, None))
+            except Exception as e:
+                chunks.put((None, e))
+            finally:
+                close = getattr(stream, 'close', None)
+                if close:
+                    close()
+
+        context = contextvars.copy_context()
+        threading.Thread(target=context.run, args=(produce,), daemon=True).start()
 
-Process this request. If you can handle it completely, respond directly. 
-If a specialist would provide better results, delegate to them."""
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise OrchestrationTimeout()
+                try:
+                    chunk, error = chunks.get(timeout=remaining)
+                except queue.Empty:
+                    raise OrchestrationTimeout()
+                if error is not None:
+                    raise error
+                if chunk is _STREAM_END:
+                    return
+                yield chunk
+        finally:
+            cancelled.set()
+
+    async def _consume_stream_async(self, agent, prompt: str, deadline: Optional[float]):
+        """Yield chunks from an agent's response without blocking the event loop.
+
+        Agents with a native ``get_response_stream_async`` are iterated directly.
+        Blocking ``get_response_stream`` generators are read on the bridge
+        executor and their chunks handed back to the loop. OrchestrationTimeout
+        is raised after the chunks received before the deadline.
+        """
+        native_stream = getattr(agent, 'get_response_stream_async', None)
+        if native_stream is not None:
+            stream = native_stream(prompt)
         else:
-            orchestration_context = f"""You are processing this request with profile: {current_profile}.
+            stream = self._bridge_stream(lambda: agent.get_response_stream(prompt)())
 
-User request: {user_input}"""
+        chunks = stream.__aiter__()
+        try:
+            while True:
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise OrchestrationTimeout()
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), remaining)
+                except StopAsyncIteration:
+                    return
+                except asyncio.TimeoutError:
+                    raise OrchestrationTimeout()
+                yield chunk
+        finally:
+            close = getattr(chunks, 'aclose', None)
+            if close:
+                await close()
+
+    async def _bridge_stream(self, open_stream: Callable[[], Any]):
+        """Read a blocking stream on the bridge executor as an async generator.
+
+        The reading thread stops at its next chunk once the generator is
+        closed, so a stalled engine keeps one bridge thread until it yields.
+        """
+        loop = asyncio.get_running_loop()
+        chunks = asyncio.Queue()
+        cancelled = threading.Event()
+
+        def put(item):
+            try:
+                loop.call_soon_threadsafe(chunks.put_nowait, item)
+            except RuntimeError:
+                # The loop has closed, nobody is reading any more
+                cancelled.set()
+
+        def produce():
+            stream = None
+            try:
+                stream = open_stream()
+                for chunk in stream:
+                    if cancelled.is_set():
+                        break
+                    put((chunk, None))
+                put((_STREAM_END, None))
+            except Exception as e:
+                put((None, e))
+            finally:
+                close = getattr(stream, 'close', None)
+                if close:
+                    close()
+
+        # Copy the context so tracking ids follow the engine call
+        loop.run_in_executor(self._bridge_executor, contextvars.copy_context().run, produce)
 
-        return orchestration_context
+        try:
+            while True:
+                chunk, error = await chunks.get()
+                if error is not None:
+                    raise error
+                if chunk is _STREAM_END:
+                    return
+                yield chunk
+        finally:
+            cancelled.set()
+
+    def _emit_progress(
+            self,
+            progress_callback: Optional[Callable[[Dict], None]],
+            stage: str,
+            profile: str,
+            depth: int = 0
+    ):
+        """Report an orchestration hop to the progress callback, if any"""
+        if progress_callback is None:
+            return
+        messages = {
+            "orchestrating": f"{profile} is planning the request",
+            "delegating": f"delegating to {profile}",
+            "synthesizing": f"{profile} is synthesizing the final response",
+        }
+        try:
+            progress_callback({
+                "stage": stage,
+                "profile": profile,
+                "depth": depth,
+                "message": messages.get(stage, stage),
+            })
+        except Exception as e:
+            print(f"Error in orchestration progress callback: {str(e)}")
+
+    def _build_orchestration_prompt(self, user_input: str) -> str:
+        """Build prompt with orchestration context"""
+        return self.active_orchestration.build_prompt(
+            self.active_orchestration.orchestrator_profile, user_input
+        )
 
     def _check_for_delegation(self, response: str) -> bool:
         """Check if response indicates delegation is needed"""
-        return response.strip().startswith("[DELEGATE:")
+        return response.strip().startswith(DELEGATE_PREFIX)
 
     def _extract_delegate_profile(self, response: str) -> str:
         """Extract the profile name from delegation instruction"""
@@ -354,73 +934,347 @@ User request: {user_input}"""
             return match.group(1)
         return "Unknown"
 
-    def _handle_delegation(
+    def _extract_delegate_profiles(self, response: str) -> List[str]:
+        """Extract every profile name named by a delegation instruction"""
+        profiles = [profile for profile, _ in self._parse_delegations(response, "")]
+        return profiles or ["Unknown"]
+
+    def _parse_delegations(self, response: str, original_request: str) -> List[Tuple[str, str]]:
+        """Split a response into (profile, task) pairs, one per [DELEGATE: X] line.
+
+        The task for a delegate is the rest of its directive line plus the lines
+        up to the next directive. An empty task falls back to the original request.
+        """
+        delegations = []
+        current_profile = None
+        task_lines = []
+
+        for line in response.split('\n'):
+            match = DELEGATE_LINE_PATTERN.match(line)
+            if match:
+                if current_profile:
+                    delegations.append((current_profile, '\n'.join(task_lines).strip() or original_request))
+                current_profile = match.group(1)
+                task_lines = [match.group(2)]
+            elif current_profile:
+                task_lines.append(line)
+
+        if current_profile:
+            delegations.append((current_profile, '\n'.join(task_lines).strip() or original_request))
+
+        return delegations
+
+    async def _handle_delegation(
             self,
             original_request: str,
             orchestrator_response: str,
-            from_profile: str
+            from_profile: str,
+            progress_callback: Optional[Callable[[Dict], None]] = None,
+            depth: int = 1,
+            deadline: Optional[float] = None,
+            thread_id: Optional[str] = None
     ) -> str:
-        """Handle delegation to specialist profiles - SYNCHRONOUS VERSION"""
+        """Handle delegation to specialist profiles
 
-        try:
-            lines = orchestrator_response.split('\n')
-            delegation_line = lines[0]
+        Several delegates named in one response run concurrently as tasks on
+        the event loop, at most communication.max_parallel_delegates at a time,
+        and their results are merged in the order they were named.
+        """
 
-            match = re.search(r'\[DELEGATE:\s*([\w_]+)\]', delegation_line)
-            if not match:
+        try:
+            delegations = self._parse_delegations(orchestrator_response, original_request)
+            if not delegations:
                 return "Delegation parsing error: Could not extract profile name"
 
-            target_profile = match.group(1)
+            max_parallel = self.active_orchestration.communication.get('max_parallel_delegates', 4)
+            slots = asyncio.Semaphore(max(1, max_parallel))
+
+            async def run(target_profile: str, task: str) -> str:
+                async with slots:
+                    try:
+                        return await self._run_delegation(
+                            original_request, orchestrator_response, from_profile,
+                            target_profile, task, depth, progress_callback, deadline, thread_id
+                        )
+                    except Exception as e:
+                        return f"Error handling delegation: {str(e)}"
+
+            results = await asyncio.gather(
+                *(run(target_profile, task) for target_profile, task in delegations)
+            )
+
+            return self._merge_delegation_results(
+                [(profile, result) for (profile, _), result in zip(delegations, results)]
+            )
+
+        except Exception as e:
+            return f"Error handling delegation: {str(e)}"
 
-            if not self.can_delegate(from_profile, target_profile):
-                return f"Delegation from {from_profile} to {target_profile} not allowed"
+    async def _run_delegation(
+            self,
+            original_request: str,
+            orchestrator_response: str,
+            from_profile: str,
+            target_profile: str,
+            task: str,
+            depth: int,
+            progress_callback: Optional[Callable[[Dict], None]] = None,
+            deadline: Optional[float] = None,
+            thread_id: Optional[str] = None
+    ) -> str:
+        """Run one delegate, following any further delegation it asks for"""
+        if not self.can_delegate(from_profile, target_profile):
+            return f"Delegation from {from_profile} to {target_profile} not allowed"
+
+        message = AgentMessage(
+            from_profile=from_profile,
+            to_profile=target_profile,
+            content=task,
+            message_type="request",
+            context={
+                "original_request": original_request,
+                "summary": orchestrator_response[:200],
+                "thread_id": thread_id
+            },
+            depth=depth
+        )
 
-            task = '\n'.join(lines[1:]).strip()
-            if not task:
-                task = original_request
+        self._emit_progress(progress_callback, "delegating", target_profile, message.depth)
+        response = await self.delegate_to_profile_async(message, deadline)
 
-            message = AgentMessage(
-                from_profile=from_profile,
-                to_profile=target_profile,
-                content=task,
-                message_type="request",
-                context={"original_request": original_request, "summary": orchestrator_response[:200]},
-                depth=1
+        if self._check_for_delegation(response):
+            response = await self._handle_delegation(
+                original_request, response, target_profile, progress_callback, depth + 1,
+                deadline, thread_id
             )
 
-            response = self.delegate_to_profile(message)
+        return response
 
-            if self._check_for_delegation(response):
-                response = self._handle_delegation(original_request, response, target_profile)
+    def _merge_delegation_results(self, results: List[Tuple[str, str]]) -> str:
+        """Merge delegate responses into one block for the synthesis prompt"""
+        if len(results) == 1:
+            return results[0][1]
+        return "\n\n".join(f"[{profile}]\n{response}" for profile, response in results)
 
+    def execute_flow(
+            self,
+            condition: str,
+            inputs: List[str],
+            progress_callback: Optional[Callable[[Dict], None]] = None
+    ) -> List[Dict]:
+        """Run a sequential_delegation rule's declared flow over a batch of inputs.
+
+        Each flow step becomes a pipeline stage with its own workers (the step's
+        ``workers`` key, default 1) and a bounded queue (the rule's
+        ``queue_size``, default 8) in front of the next stage, so different
+        inputs occupy different stages at the same time. The whole run has one
+        deadline from ``communication.timeout_seconds``, and each step gets
+        only the time left. Returns one result dict per input, in input order.
+        """
+        config = self.active_orchestration
+        if not config:
+            raise ValueError("No active orchestration configuration set")
+
+        rule = config.get_rule(condition, 'sequential_delegation')
+        if rule is None or not rule.get('flow'):
+            raise ValueError(f"No sequential_delegation flow found for condition '{condition}'")
+
+        timeout = config.communication.get('timeout_seconds')
+        deadline = time.monotonic() + float(timeout) if timeout else None
+        stages = []
+        previous_profile = config.orchestrator_profile
+        for depth, step in enumerate(rule['flow']):
+            profile_name = step['profile']
+            stages.append(PipelineStage(
+                profile_name,
+                self._flow_step_function(
+                    config, previous_profile, profile_name, step.get('task', ''), depth, deadline
+                ),
+                step.get('workers', 1)
+            ))
+            previous_profile = profile_name
+
+        executor = PipelineExecutor(stages, rule.get('queue_size', 8))
+        pin = self._pin_orchestration(config)
+        try:
+            return executor.run(inputs, progress_callback)
+        finally:
+            self._unpin_orchestration(pin)
+
+    def _flow_step_function(
+            self,
+            config: OrchestrationConfig,
+            from_profile: str,
+            profile_name: str,
+            task: str,
+            depth: int,
+            deadline: Optional[float] = None
+    ) -> Callable[[str], str]:
+        """Build the stage function that runs one flow step on one input before ``deadline``"""
+        engine_name = config.profile_to_engine.get(profile_name, 'AzureOpenAIAgent')
+
+        def run_step(step_input: str) -> str:
+            prompt = f"{task}\n\nInput:\n{step_input}" if task else step_input
+            cache = self._get_response_cache(config)
+            cache_key = None
+            response = None
+            if cache is not None:
+                cache_key = ResponseCache.make_key(config.name, profile_name, engine_name, prompt)
+                response = cache.get(cache_key)
+            if response is None:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise OrchestrationTimeout(f"{profile_name} not started, the flow ran out of time")
+                response = self._run_profile(profile_name, engine_name, prompt, deadline)
+                if cache is not None:
+                    cache.set(cache_key, response)
+            self.conversation_history.append({
+                "orchestration": config.name,
+                "thread_id": None,
+                "from": from_profile,
+                "to": profile_name,
+                "request": prompt,
+                "response": response,
+                "depth": depth
+            })
             return response
 
-        except Exception as e:
-            return f"Error handling delegation: {str(e)}"
+        return run_step
+
+    def _run_profile(
+            self,
+            profile_name: str,
+            engine_name: str,
+            prompt: str,
+            deadline: Optional[float] = None
+    ) -> str:
+        """Run a prompt on a pooled agent for the profile and collect the response"""
+        agent = self.initialize_agent_with_profile(profile_name, engine_name)
+        response = ""
+        try:
+            response_generator = agent.get_response_stream(prompt)
+            for chunk in self._consume_stream(response_generator, deadline):
+                response += chunk
+            return response
+        except OrchestrationTimeout:
+            self.agent_pool.discard(agent)
+            agent = None
+            raise OrchestrationTimeout(f"{profile_name} timed out after partial output: {response[:200]}")
+        finally:
+            self.release_agent(agent)
+
+    def orchestrate_request_stream(
+            self,
+            user_input: str,
+            thread_id: Optional[str] = None,
+            progress_callback: Optional[Callable[[Dict], None]] = None
+    ):
+        """Stream version - returns a generator like agent.get_response_stream()
 
-    def orchestrate_request_stream(self, user_input: str, thread_id: Optional[str] = None):
-        """Stream version - returns a generator like agent.get_response_stream()"""
+        Chunks from the orchestrator and the synthesis pass are yielded as the
+        engines produce them. Each hop (planning, delegating to a profile,
+        synthesizing) is reported to ``progress_callback`` as a dict with
+        ``stage``, ``profile``, ``depth`` and ``message`` keys. The request runs
+        on the engine loop; chunks and progress events are handed back so the
+        callback is invoked from the calling thread.
+        """
 
         if not self.active_orchestration:
             yield "Error: No active orchestration configuration set"
             return
 
-        try:
-            # Get the full response synchronously
-            result = self.orchestrate_request(user_input, thread_id)
+        events = queue.Queue()
+        relay = (lambda event: events.put((None, event))) if progress_callback else None
 
-            # Stream it character by character for UI consistency
-            for char in result:
-                yield char
+        async def pump():
+            try:
+                async for chunk in self.orchestrate_request_stream_async(user_input, thread_id, relay):
+                    events.put((chunk, None))
+            finally:
+                events.put((_STREAM_END, None))
 
-        except Exception as e:
-            yield f"Error during orchestration: {str(e)}"
+        future = self._submit(pump())
+        try:
+            while True:
+                chunk, event = events.get()
+                if chunk is _STREAM_END:
+                    break
+                if event is None:
+                    yield chunk
+                    continue
+                try:
+                    progress_callback(event)
+                except Exception as e:
+                    print(f"Error in orchestration progress callback: {str(e)}")
+            future.result()
+        finally:
+            # Stops the request if the caller abandons the stream early
+            future.cancel()
+
+    def _get_engine_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the event loop the synchronous API runs requests on, starting it once"""
+        with self._engine_lock:
+            if self._engine_loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="orchestration-engine", daemon=True
+                )
+                thread.start()
+                self._engine_loop, self._engine_thread = loop, thread
+            return self._engine_loop
+
+    def _submit(self, coroutine) -> Future:
+        """Schedule a coroutine on the engine loop in a copy of the caller's context"""
+        context = contextvars.copy_context()
+
+        async def run_in_context():
+            return await asyncio.get_running_loop().create_task(coroutine, context=context)
+
+        return asyncio.run_coroutine_threadsafe(run_in_context(), self._get_engine_loop())
+
+    def _run_sync(self, coroutine):
+        """Run a coroutine on the engine loop and wait for its result"""
+        if threading.current_thread() is self._engine_thread:
+            coroutine.close()
+            raise RuntimeError("Synchronous orchestration called from the engine loop; await the async method")
+        return self._submit(coroutine).result()
+
+    def shutdown_engine(self):
+        """Stop the engine loop and the threads bridging blocking agent streams"""
+        with self._engine_lock:
+            loop, thread = self._engine_loop, self._engine_thread
+            self._engine_loop = self._engine_thread = None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+        self._bridge_executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_conversation_history(
+            self,
+            page: int = 0,
+            page_size: int = 20,
+            thread_id: Optional[str] = None,
+            profile: Optional[str] = None
+    ) -> List[Dict]:
+        """Get one page of the active orchestration's A2A history, newest first"""
+        return self.conversation_history.get_page(
+            page, page_size, self._active_orchestration_name(), thread_id, profile
+        )
 
-    def get_conversation_history(self) -> List[Dict]:
-        """Get the A2A conversation history"""
-        return self.conversation_history.copy()
+    def count_conversation_history(
+            self,
+            thread_id: Optional[str] = None,
+            profile: Optional[str] = None
+    ) -> int:
+        """Count the active orchestration's A2A history entries"""
+        return self.conversation_history.count(
+            self._active_orchestration_name(), thread_id, profile
+        )
 
     def clear_conversation_history(self):
         """Clear the A2A conversation history"""
-        self.conversation_history = []
+        self.conversation_history.clear(self._active_orchestration_name())
         print("A2A conversation history cleared")
+
+    def _active_orchestration_name(self) -> Optional[str]:
+        return self.active_orchestration.name if self.active_orchestration else None
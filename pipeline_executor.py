@@ -0,0 +1,138 @@
+import contextvars
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+_STOP = object()
+
+
+class PipelineStage:
+    """One step of a pipeline: a function applied by its own pool of workers"""
+
+    def __init__(self, name: str, function: Callable[[Any], Any], workers: int = 1):
+        self.name = name
+        self.function = function
+        self.workers = max(1, int(workers))
+
+
+class PipelineExecutor:
+    """Runs a batch of inputs through stages connected by bounded queues.
+
+    Every stage has its own worker threads, so item N+1 can be in the first
+    stage while item N is in the second. A full queue blocks the stage feeding
+    it, which keeps memory bounded when a later stage is the bottleneck. An
+    item whose stage raises skips the remaining stages and is reported with
+    its error.
+    """
+
+    def __init__(self, stages: List[PipelineStage], queue_size: int = 8):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = stages
+        self.queue_size = max(1, int(queue_size))
+
+    def run(
+            self,
+            inputs: Iterable[Any],
+            progress_callback: Optional[Callable[[Dict], None]] = None
+    ) -> List[Dict]:
+        """Process every input and return results in input order.
+
+        Each result is a dict with ``input``, ``output``, ``stages`` (output per
+        stage name) and ``error``. ``progress_callback`` is invoked from worker
+        threads after each stage finishes an item.
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        results: Dict[int, Dict] = {}
+        results_lock = threading.Lock()
+        threads = []
+
+        for stage_index, stage in enumerate(self.stages):
+            remaining = [stage.workers]
+            remaining_lock = threading.Lock()
+            for _ in range(stage.workers):
+                # Workers run in a copy of the caller's context so tracking ids carry over
+                thread = threading.Thread(
+                    target=contextvars.copy_context().run,
+                    args=(self._work, stage_index, stage, queues[stage_index], queues[stage_index + 1],
+                          remaining, remaining_lock, progress_callback),
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+        collector = threading.Thread(
+            target=self._collect, args=(queues[-1], results, results_lock), daemon=True
+        )
+        collector.start()
+
+        count = 0
+        for index, item in enumerate(inputs):
+            queues[0].put({"index": index, "input": item, "value": item, "stages": {}, "error": None})
+            count += 1
+        queues[0].put(_STOP)
+
+        for thread in threads:
+            thread.join()
+        collector.join()
+
+        return [
+            {
+                "input": results[index]["input"],
+                "output": results[index]["value"] if results[index]["error"] is None else None,
+                "stages": results[index]["stages"],
+                "error": results[index]["error"],
+            }
+            for index in range(count)
+        ]
+
+    def _work(
+            self,
+            stage_index: int,
+            stage: PipelineStage,
+            inbox: queue.Queue,
+            outbox: queue.Queue,
+            remaining: List[int],
+            remaining_lock: threading.Lock,
+            progress_callback: Optional[Callable[[Dict], None]]
+    ):
+        while True:
+            item = inbox.get()
+            if item is _STOP:
+                # Let sibling workers see the stop marker too
+                inbox.put(_STOP)
+                break
+
+            if item["error"] is None:
+                try:
+                    item["value"] = stage.function(item["value"])
+                    item["stages"][stage.name] = item["value"]
+                except Exception as e:
+                    item["error"] = f"{stage.name}: {str(e)}"
+
+                if progress_callback:
+                    try:
+                        progress_callback({
+                            "stage": stage.name,
+                            "stage_index": stage_index,
+                            "index": item["index"],
+                            "error": item["error"],
+                        })
+                    except Exception as e:
+                        print(f"Error in pipeline progress callback: {str(e)}")
+
+            outbox.put(item)
+
+        with remaining_lock:
+            remaining[0] -= 1
+            last_worker = remaining[0] == 0
+        if last_worker:
+            outbox.put(_STOP)
+
+    def _collect(self, inbox: queue.Queue, results: Dict[int, Dict], results_lock: threading.Lock):
+        while True:
+            item = inbox.get()
+            if item is _STOP:
+                break
+            with results_lock:
+                results[item["index"]] = item
@@ -0,0 +1,195 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class ResponseCache:
+    """LRU cache of delegate responses with TTL and size limits.
+
+    Entries are kept in memory, least recently used first out once either
+    ``max_entries`` or ``max_bytes`` is exceeded, and expire ``ttl_seconds``
+    after they were stored. With a ``path`` the entries are also written to a
+    SQLite file so they survive restarts; misses in memory fall back to it.
+    The file is held to the same limits, least recently accessed rows first.
+    """
+
+    def __init__(
+            self,
+            ttl_seconds: Optional[float] = 3600,
+            max_entries: int = 256,
+            max_bytes: Optional[int] = None,
+            path: Optional[str] = None
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.path = path
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._connection = None
+        self._disk_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        if path:
+            self._open_store(path)
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Hash the parts that identify a response into a cache key"""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(str(part).encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response, or None on a miss or expired entry"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                if not self._expired(stored_at, now):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._remove_locked(key)
+
+            if self._connection is not None:
+                row = self._connection.execute(
+                    "SELECT value, stored_at FROM response_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, stored_at = row
+                    if not self._expired(stored_at, now):
+                        self._connection.execute(
+                            "UPDATE response_cache SET accessed_at = ? WHERE key = ?", (now, key)
+                        )
+                        self._connection.commit()
+                        self._store_locked(key, value, stored_at)
+                        self.hits += 1
+                        return value
+                    self._delete_row_locked(key)
+                    self._connection.commit()
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str):
+        """Store a response, evicting least recently used entries if needed"""
+        now = time.time()
+        with self._lock:
+            self._store_locked(key, value, now)
+            if self._connection is not None:
+                self._delete_row_locked(key)
+                self._connection.execute(
+                    "INSERT INTO response_cache (key, value, stored_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, value, now, now)
+                )
+                self._disk_bytes += len(value.encode("utf-8"))
+                self._trim_store_locked(now)
+                self._connection.commit()
+
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self._connection is not None:
+                self._connection.execute("DELETE FROM response_cache")
+                self._connection.commit()
+                self._disk_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "disk_evictions": self.disk_evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "disk_bytes": self._disk_bytes,
+                "persistent": self._connection is not None,
+            }
+
+    def _open_store(self, path: str):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS response_cache_accessed ON response_cache (accessed_at)"
+        )
+        self._connection.commit()
+        self._disk_bytes = self._connection.execute(
+            "SELECT COALESCE(SUM(LENGTH(CAST(value AS BLOB))), 0) FROM response_cache"
+        ).fetchone()[0]
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - stored_at > self.ttl_seconds
+
+    def _store_locked(self, key: str, value: str, stored_at: float):
+        if key in self._entries:
+            self._remove_locked(key)
+        self._entries[key] = (value, stored_at)
+        self._bytes += len(value.encode("utf-8"))
+        while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            oldest = next(iter(self._entries))
+            self._remove_locked(oldest)
+            self.evictions += 1
+
+    def _remove_locked(self, key: str):
+        value, _ = self._entries.pop(key)
+        self._bytes -= len(value.encode("utf-8"))
+
+    def _delete_row_locked(self, key: str):
+        row = self._connection.execute(
+            "SELECT LENGTH(CAST(value AS BLOB)) FROM response_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            self._connection.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+            self._disk_bytes -= row[0]
+
+    def _trim_store_locked(self, now: float):
+        if self.ttl_seconds is not None:
+            for (key,) in self._connection.execute(
+                "SELECT key FROM response_cache WHERE stored_at < ?", (now - self.ttl_seconds,)
+            ).fetchall():
+                self._delete_row_locked(key)
+        count = self._connection.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+        while count > self.max_entries or (
+                self.max_bytes is not None and self._disk_bytes > self.max_bytes
+        ):
+            rows = self._connection.execute(
+                "SELECT key FROM response_cache ORDER BY accessed_at ASC LIMIT 256"
+            ).fetchall()
+            if not rows:
+                self._disk_bytes = 0
+                return
+            for (key,) in rows:
+                if count <= self.max_entries and (
+                        self.max_bytes is None or self._disk_bytes <= self.max_bytes
+                ):
+                    break
+                self._delete_row_locked(key)
+                count -= 1
+                self.disk_evictions += 1
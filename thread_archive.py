@@ -0,0 +1,292 @@
+import json
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from peewee import (
+    BlobField,
+    DateTimeField,
+    ForeignKeyField,
+    IntegerField,
+    Model,
+    TextField,
+    fn,
+)
+
+from nexus.nexus_base.nexus_models import (
+    ChatParticipants,
+    Message,
+    Notification,
+    Thread,
+    db,
+)
+
+
+class ArchivedMessageSegment(Model):
+    """A run of consecutive old messages from a thread, compressed into one row"""
+
+    thread = ForeignKeyField(Thread, field=Thread.thread_id, backref="archived_segments")
+    sequence = IntegerField()
+    message_count = IntegerField()
+    min_message_id = IntegerField()
+    max_message_id = IntegerField()
+    first_timestamp = DateTimeField()
+    last_timestamp = DateTimeField()
+    data = BlobField()
+    summary = TextField(null=True)
+    created = DateTimeField(default=datetime.now)
+
+    class Meta:
+        database = db
+        indexes = ((("thread", "sequence"), True),)
+
+
+class ThreadArchiveManager:
+    """Moves old messages out of the hot Message table into compressed segments.
+
+    Only the oldest messages of a thread are archived, so a thread is always
+    its archived segments, in sequence order, followed by its live messages.
+    That lets reads fall through to the archive once the live messages run
+    out. Notifications for archived messages are dropped with them.
+    """
+
+    def __init__(self, segment_size: int = 200, cached_segments: int = 16):
+        db.create_tables([ArchivedMessageSegment], safe=True)
+        self.segment_size = max(1, segment_size)
+        self.cached_segments = cached_segments
+        self._segments = OrderedDict()
+        self._segments_lock = threading.Lock()
+
+    def archive_thread(
+            self,
+            thread_id: str,
+            keep_last: Optional[int] = None,
+            older_than: Optional[timedelta] = None,
+            summarize: Optional[Callable[[List[Dict]], str]] = None
+    ) -> int:
+        """Archive messages beyond the last ``keep_last`` or older than ``older_than``.
+
+        A message is archived if either limit applies to it, but the newest
+        message of a thread is always kept. ``summarize``
+        gets each segment's messages as dicts and returns summary text to
+        store with it. Returns the number of messages archived.
+        """
+        if keep_last is None and older_than is None:
+            return 0
+
+        # Decide on ids and timestamps alone, content is only read for what moves
+        ordered = list(
+            Message.select(Message.id, Message.timestamp)
+            .where(Message.thread == thread_id)
+            .order_by(Message.timestamp.asc(), Message.id.asc())
+            .tuples()
+        )
+        count = 0
+        if keep_last is not None:
+            count = max(count, len(ordered) - keep_last)
+        if older_than is not None:
+            cutoff = datetime.now() - older_than
+            older = 0
+            while older < len(ordered) and ordered[older][1] < cutoff:
+                older += 1
+            count = max(count, older)
+        # The newest message stays live, otherwise emptying the table would let
+        # SQLite reuse ids that archived segments still hold
+        count = min(count, len(ordered) - 1)
+        if count <= 0:
+            return 0
+
+        archived = 0
+        for start in range(0, count, self.segment_size):
+            message_ids = [message_id for message_id, _ in ordered[start:min(count, start + self.segment_size)]]
+            rows = [
+                {
+                    "id": message_id,
+                    "author": author_id,
+                    "role": role,
+                    "content": content,
+                    "timestamp": timestamp.isoformat(),
+                }
+                for message_id, author_id, role, content, timestamp in Message.select(
+                    Message.id, Message.author, Message.role, Message.content, Message.timestamp
+                )
+                .where(Message.id.in_(message_ids))
+                .order_by(Message.timestamp.asc(), Message.id.asc())
+                .tuples()
+            ]
+            summary = summarize(rows) if summarize else None
+            self._write_segment(thread_id, rows, summary)
+            archived += len(rows)
+        return archived
+
+    def get_archivable_threads(self, keep_last: int) -> List[str]:
+        """Get the threads with more than ``keep_last`` live messages"""
+        return [
+            thread_id
+            for (thread_id,) in Message.select(Message.thread)
+            .group_by(Message.thread)
+            .having(fn.COUNT(Message.id) > keep_last)
+            .tuples()
+        ]
+
+    def read_before(
+            self,
+            thread_id: str,
+            limit: int,
+            before_id: Optional[int] = None
+    ) -> List[Message]:
+        """Read up to ``limit`` archived messages, oldest first.
+
+        These are the ones just before ``before_id`` when that message is
+        itself archived, otherwise the newest archived messages. Messages come
+        back as unsaved Message objects with their authors attached.
+        """
+        segments = list(
+            ArchivedMessageSegment.select(
+                ArchivedMessageSegment.id,
+                ArchivedMessageSegment.min_message_id,
+                ArchivedMessageSegment.max_message_id,
+            )
+            .where(ArchivedMessageSegment.thread == thread_id)
+            .order_by(ArchivedMessageSegment.sequence.desc())
+            .tuples()
+        )
+
+        start, cut = 0, None
+        if before_id is not None:
+            for index, (segment_id, min_id, max_id) in enumerate(segments):
+                if min_id <= before_id <= max_id:
+                    ids = [row["id"] for row in self._load_segment(segment_id)]
+                    if before_id in ids:
+                        start, cut = index, ids.index(before_id)
+                        break
+
+        rows = []
+        for index in range(start, len(segments)):
+            segment_rows = self._load_segment(segments[index][0])
+            if index == start and cut is not None:
+                segment_rows = segment_rows[:cut]
+            if segment_rows:
+                rows = segment_rows[-(limit - len(rows)):] + rows
+            if len(rows) >= limit:
+                break
+
+        authors = {
+            participant.user_id: participant
+            for participant in ChatParticipants.select().where(
+                ChatParticipants.user_id.in_(list({row["author"] for row in rows}))
+            )
+        } if rows else {}
+        for row in rows:
+            if row["author"] not in authors:
+                # The participant was deleted, keep the message renderable
+                authors[row["author"]] = ChatParticipants(
+                    user_id=row["author"],
+                    username=row["author"],
+                    display_name=row["author"],
+                )
+        return [
+            Message(
+                id=row["id"],
+                thread=thread_id,
+                author=authors[row["author"]],
+                role=row["role"],
+                content=row["content"],
+                timestamp=datetime.fromisoformat(row["timestamp"]),
+            )
+            for row in rows
+        ]
+
+    def get_message_timestamp(self, thread_id: str, message_id: int) -> Optional[datetime]:
+        """Get when an archived message was posted, or None if it is not archived"""
+        segment_ids = (
+            ArchivedMessageSegment.select(ArchivedMessageSegment.id)
+            .where(
+                (ArchivedMessageSegment.thread == thread_id)
+                & (ArchivedMessageSegment.min_message_id <= message_id)
+                & (ArchivedMessageSegment.max_message_id >= message_id)
+            )
+            .tuples()
+        )
+        for (segment_id,) in segment_ids:
+            for row in self._load_segment(segment_id):
+                if row["id"] == message_id:
+                    return datetime.fromisoformat(row["timestamp"])
+        return None
+
+    def get_summaries(self, thread_id: str) -> List[str]:
+        """Get the summaries stored with a thread's segments, oldest first"""
+        return [
+            summary
+            for (summary,) in ArchivedMessageSegment.select(ArchivedMessageSegment.summary)
+            .where(
+                (ArchivedMessageSegment.thread == thread_id)
+                & ArchivedMessageSegment.summary.is_null(False)
+            )
+            .order_by(ArchivedMessageSegment.sequence.asc())
+            .tuples()
+        ]
+
+    def count_archived(self, thread_id: str) -> int:
+        """Count a thread's archived messages"""
+        return (
+            ArchivedMessageSegment.select(fn.COALESCE(fn.SUM(ArchivedMessageSegment.message_count), 0))
+            .where(ArchivedMessageSegment.thread == thread_id)
+            .scalar()
+        )
+
+    def delete_thread(self, thread_id: str) -> int:
+        """Delete every archived segment of a thread"""
+        with self._segments_lock:
+            self._segments.clear()
+        with db.atomic():
+            return (
+                ArchivedMessageSegment.delete()
+                .where(ArchivedMessageSegment.thread == thread_id)
+                .execute()
+            )
+
+    def _write_segment(self, thread_id: str, rows: List[Dict], summary: Optional[str]):
+        message_ids = [row["id"] for row in rows]
+        data = zlib.compress(json.dumps(rows).encode("utf-8"))
+        with db.atomic():
+            sequence = (
+                ArchivedMessageSegment.select(fn.COALESCE(fn.MAX(ArchivedMessageSegment.sequence), 0))
+                .where(ArchivedMessageSegment.thread == thread_id)
+                .scalar()
+            ) + 1
+            ArchivedMessageSegment.create(
+                thread=thread_id,
+                sequence=sequence,
+                message_count=len(rows),
+                min_message_id=min(message_ids),
+                max_message_id=max(message_ids),
+                first_timestamp=datetime.fromisoformat(rows[0]["timestamp"]),
+                last_timestamp=datetime.fromisoformat(rows[-1]["timestamp"]),
+                data=data,
+                summary=summary,
+            )
+            Notification.delete().where(Notification.message.in_(message_ids)).execute()
+            Message.delete().where(Message.id.in_(message_ids)).execute()
+
+    def _load_segment(self, segment_id: int) -> List[Dict]:
+        with self._segments_lock:
+            rows = self._segments.get(segment_id)
+            if rows is not None:
+                self._segments.move_to_end(segment_id)
+                return rows
+
+        data = (
+            ArchivedMessageSegment.select(ArchivedMessageSegment.data)
+            .where(ArchivedMessageSegment.id == segment_id)
+            .scalar()
+        )
+        rows = json.loads(zlib.decompress(bytes(data)).decode("utf-8"))
+
+        with self._segments_lock:
+            self._segments[segment_id] = rows
+            while len(self._segments) > self.cached_segments:
+                self._segments.popitem(last=False)
+        return rows
@@ -0,0 +1,277 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # Only the local index needs numpy
+    np = None
+
+# Queries are scored this many at a time to bound the size of the score matrix
+QUERY_CHUNK_SIZE = 256
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("The local vector index needs numpy, install it with `pip install numpy`")
+
+
+def store_fingerprint(ids: Sequence[str]) -> str:
+    """Fingerprint of a store's ids, saved with an index to tell whether the store changed since"""
+    digest = hashlib.sha256()
+    for entry_id in ids:
+        digest.update(str(entry_id).encode("utf-8"))
+        digest.update(b"\0")
+    return f"{len(ids)}:{digest.hexdigest()}"
+
+
+def _normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    # Zero vectors stay zero rather than becoming NaN
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class VectorIndex:
+    """Brute-force cosine similarity index over one store's embeddings.
+
+    Embeddings are normalized once and kept as a contiguous float32 matrix,
+    memory-mapped from ``path`` when one is given, so a query is a single
+    matrix product followed by an ``argpartition`` for the top results.
+    The index is immutable; rebuild it when the store changes. Its
+    ``fingerprint`` (see ``store_fingerprint``) is saved alongside, so a
+    saved copy can be checked against the store before it is reused.
+    """
+
+    def __init__(
+            self,
+            ids: Sequence[str],
+            embeddings: Any,
+            documents: Optional[Sequence[str]] = None,
+            metadatas: Optional[Sequence[Dict]] = None,
+            path: Optional[str] = None
+    ):
+        _require_numpy()
+        self.ids = list(ids)
+        self.fingerprint = store_fingerprint(self.ids)
+        self.documents = list(documents) if documents is not None else [None] * len(self.ids)
+        self.metadatas = list(metadatas) if metadatas is not None else [None] * len(self.ids)
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.size == 0:
+            matrix = matrix.reshape(0, matrix.shape[-1] if matrix.ndim == 2 else 0)
+        if matrix.ndim != 2 or matrix.shape[0] != len(self.ids):
+            raise ValueError(f"expected {len(self.ids)} embeddings as rows, got shape {matrix.shape}")
+        if not (len(self.documents) == len(self.metadatas) == len(self.ids)):
+            raise ValueError("ids, documents and metadatas must have the same length")
+        self.matrix = np.ascontiguousarray(_normalize(matrix))
+        self.path = path
+        if path:
+            self._save(path)
+
+    @classmethod
+    def open(cls, path: str) -> Optional["VectorIndex"]:
+        """Open an index saved at ``path``, or None if it is missing or incomplete"""
+        _require_numpy()
+        try:
+            with open(path + ".json", "r", encoding="utf-8") as f:
+                header = json.load(f)
+            count, dimensions = header["count"], header["dimensions"]
+            if os.path.getsize(path + ".f32") != count * dimensions * 4:
+                return None
+        except (OSError, ValueError, KeyError):
+            return None
+
+        index = cls.__new__(cls)
+        index.ids = header["ids"]
+        index.documents = header["documents"]
+        index.metadatas = header["metadatas"]
+        # Indexes saved before fingerprints were added never match a store
+        index.fingerprint = header.get("fingerprint")
+        index.path = path
+        if count == 0:
+            index.matrix = np.zeros((0, dimensions), dtype=np.float32)
+        else:
+            index.matrix = np.memmap(path + ".f32", dtype=np.float32, mode="r", shape=(count, dimensions))
+        return index
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def dimensions(self) -> int:
+        return self.matrix.shape[1]
+
+    def query(self, query_embeddings: Any, n_results: int = 5) -> Dict[str, List[List[Any]]]:
+        """Find the nearest entries for one or more query embeddings.
+
+        Returns ``ids``, ``documents``, ``metadatas`` and ``distances`` (cosine
+        distance, nearest first), each holding one list per query.
+        """
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries.reshape(1, -1)
+        if len(self) and queries.shape[1] != self.dimensions:
+            raise ValueError(f"query has {queries.shape[1]} dimensions, index has {self.dimensions}")
+
+        results = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        k = min(max(0, n_results), len(self))
+        if k == 0:
+            for key in results:
+                results[key] = [[] for _ in range(len(queries))]
+            return results
+
+        for start in range(0, len(queries), QUERY_CHUNK_SIZE):
+            scores = _normalize(queries[start:start + QUERY_CHUNK_SIZE]) @ self.matrix.T
+            if k < scores.shape[1]:
+                # Only the top k are ordered, the rest of the row is left unsorted
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            else:
+                top = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind="stable")
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+            for rows, row_scores in zip(top.tolist(), top_scores.tolist()):
+                results["ids"].append([self.ids[row] for row in rows])
+                results["documents"].append([self.documents[row] for row in rows])
+                results["metadatas"].append([self.metadatas[row] for row in rows])
+                results["distances"].append([1.0 - score for score in row_scores])
+        return results
+
+    def _save(self, path: str):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Write to temporary files and swap them in, so readers of an older
+        # memory map keep a consistent view
+        with open(path + ".f32.tmp", "wb") as f:
+            f.write(self.matrix.tobytes())
+        with open(path + ".json.tmp", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "count": len(self.ids),
+                    "dimensions": self.dimensions,
+                    "fingerprint": self.fingerprint,
+                    "ids": self.ids,
+                    "documents": self.documents,
+                    "metadatas": self.metadatas,
+                },
+                f,
+                default=str,
+            )
+        os.replace(path + ".f32.tmp", path + ".f32")
+        os.replace(path + ".json.tmp", path + ".json")
+        if len(self.ids):
+            self.matrix = np.memmap(path + ".f32", dtype=np.float32, mode="r", shape=self.matrix.shape)
+
+
+class VectorIndexManager:
+    """Local indexes for knowledge and memory stores, built on first query.
+
+    Each index is built from ``load()``, which returns the store's contents
+    as ``ids``, ``embeddings``, ``documents`` and ``metadatas``, and saved
+    to ``directory``. A saved copy is reused by a later process only when
+    ``load_ids()`` shows the store still has the same ids, since writes made
+    elsewhere never invalidate it. Without a directory the indexes are kept
+    in memory only.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        _require_numpy()
+        self.directory = directory
+        self._indexes: Dict[tuple, VectorIndex] = {}
+        self._lock = threading.Lock()
+        self._build_locks: Dict[tuple, threading.Lock] = {}
+
+    def get(
+            self,
+            kind: str,
+            store_name: str,
+            load: Callable[[], Dict],
+            load_ids: Optional[Callable[[], Sequence[str]]] = None
+    ) -> VectorIndex:
+        """Get the index for a store, opening or building it if needed"""
+        key = (kind, store_name)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                return index
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        with build_lock:
+            with self._lock:
+                index = self._indexes.get(key)
+            if index is not None:
+                # Built by another thread while this one waited
+                return index
+            path = self._path(kind, store_name)
+            index = VectorIndex.open(path) if path and load_ids is not None else None
+            if index is not None and index.fingerprint != store_fingerprint(load_ids() or []):
+                index = None
+            if index is None:
+                contents = load() or {}
+                index = VectorIndex(
+                    contents.get("ids") or [],
+                    contents.get("embeddings") if contents.get("embeddings") is not None else [],
+                    contents.get("documents"),
+                    contents.get("metadatas"),
+                    path=path,
+                )
+            with self._lock:
+                self._indexes[key] = index
+            return index
+
+    def put(
+            self,
+            kind: str,
+            store_name: str,
+            ids: Sequence[str],
+            embeddings: Any,
+            documents: Optional[Sequence[str]] = None,
+            metadatas: Optional[Sequence[Dict]] = None
+    ) -> VectorIndex:
+        """Replace a store's index with the given entries"""
+        key = (kind, store_name)
+        with self._lock:
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+        with build_lock:
+            index = VectorIndex(ids, embeddings, documents, metadatas, path=self._path(kind, store_name))
+            with self._lock:
+                self._indexes[key] = index
+            return index
+
+    def query(
+            self,
+            kind: str,
+            store_name: str,
+            query_embeddings: Any,
+            n_results: int,
+            load: Callable[[], Dict],
+            load_ids: Optional[Callable[[], Sequence[str]]] = None
+    ) -> Dict[str, List[List[Any]]]:
+        """Query a store's index, building it first if needed"""
+        return self.get(kind, store_name, load, load_ids).query(query_embeddings, n_results)
+
+    def invalidate(self, kind: str, store_name: str):
+        """Drop a store's index so the next query rebuilds it"""
+        key = (kind, store_name)
+        with self._lock:
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+        with build_lock:
+            with self._lock:
+                self._indexes.pop(key, None)
+            path = self._path(kind, store_name)
+            if path:
+                for suffix in (".json", ".f32"):
+                    try:
+                        os.remove(path + suffix)
+                    except FileNotFoundError:
+                        pass
+
+    def _path(self, kind: str, store_name: str) -> Optional[str]:
+        if not self.directory:
+            return None
+        digest = hashlib.sha256(store_name.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, f"{kind}-{digest}")